@@ -0,0 +1,202 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from chargement import matrice_depuis_coordonnees
+from controle import Controle
+from instrumentation import Instrumentation
+from solveurs import resoudre
+
+# -----------------------------------------------
+# Banc d'essai reproductible : recuit, tabou, GA roulette et GA rang
+# sur des instances euclidiennes générées (uniformes et regroupées).
+#   python benchmark.py --tailles 50 200 --repetitions 3 --sortie resultats.json
+# Pour chaque (instance, algorithme, graine) on mesure :
+#   duree : temps d'horloge de la résolution (sans la construction de l'instance)
+#   iterations : itérations de l'algorithme (recuit : mouvements, tabou :
+#       itérations, GA : générations), non comparables d'un algorithme à l'autre
+#   evaluations_par_seconde : mouvements ou solutions évalués par seconde
+#       (phase evaluation de l'Instrumentation : un delta du recuit, chaque
+#       candidat examiné par le tabou, chaque enfant du GA)
+#   memoire_max : pic de mémoire Python (tracemalloc), mesuré dans une seconde
+#       exécution du même nombre d'itérations : tracemalloc ralentit le code,
+#       il fausserait la durée et, borné par le temps, ferait moins de travail
+#   ecart : écart en % à la meilleure distance connue de l'instance
+#       (fichier --reference, sinon meilleure distance trouvée dans ce banc)
+# Sortie JSON : comparer deux fichiers permet de suivre les régressions.
+# -----------------------------------------------
+
+TAILLES = (50, 200, 1000, 5000)
+TYPES_INSTANCES = ('aleatoire', 'regroupee')
+
+# nom -> (algorithme de solveurs.py, paramètres en fonction du nombre de villes n)
+ALGORITHMES = {
+    'recuit': ('recuit', lambda n: {'max_iterations': 200 * n}),
+    'tabou': ('tabou', lambda n: {'nombre_iterations': 2 * n}),
+    'ga_roulette': ('genetique', lambda n: {'selection': 'roulette', 'generations': 500}),
+    'ga_rang': ('genetique', lambda n: {'selection': 'rang', 'generations': 500}),
+}
+
+# Au-delà de SEUIL_DENSE villes, la matrice est paresseuse (voir chargement.py)
+SEUIL_DENSE = 1000
+
+def coordonnees_aleatoires(n, graine, cote=1000):
+    """
+    n villes uniformes dans un carré cote x cote
+    Exemple : coordonnees_aleatoires(3, 0) -> [(844.4, 757.9), ...] (toujours les mêmes pour la graine 0)
+    """
+    rng = random.Random(graine)
+    return [(rng.uniform(0, cote), rng.uniform(0, cote)) for _ in range(n)]
+
+def coordonnees_regroupees(n, graine, cote=1000, nombre_groupes=None):
+    """
+    n villes réparties en groupes gaussiens autour de centres aléatoires
+    nombre_groupes : par défaut environ racine(n) / 2
+    """
+    rng = random.Random(graine)
+    nombre_groupes = nombre_groupes or max(2, int(math.sqrt(n) / 2))
+    centres = [(rng.uniform(0, cote), rng.uniform(0, cote)) for _ in range(nombre_groupes)]
+    ecart_type = cote / (4 * nombre_groupes)
+    villes = []
+    for _ in range(n):
+        cx, cy = rng.choice(centres)
+        x = min(cote, max(0, rng.gauss(cx, ecart_type)))
+        y = min(cote, max(0, rng.gauss(cy, ecart_type)))
+        villes.append((x, y))
+    return villes
+
+GENERATEURS = {
+    'aleatoire': coordonnees_aleatoires,
+    'regroupee': coordonnees_regroupees,
+}
+
+def generer_instance(type_instance, n, graine):
+    """
+    Retourne (nom, matrice) ; même (type, n, graine) -> même instance
+    """
+    if type_instance not in GENERATEURS:
+        raise ValueError("Type d'instance inconnu : %r (choix : %s)" % (type_instance, ", ".join(GENERATEURS)))
+    coordonnees = GENERATEURS[type_instance](n, graine)
+    matrice = matrice_depuis_coordonnees(coordonnees, 'EUC_2D', seuil_dense=SEUIL_DENSE)
+    return "%s_%d_%d" % (type_instance, n, graine), matrice
+
+def executer(algorithme, matrice, graine, controle, instrumentation=None):
+    # Une résolution chronométrée ; retourne (distance, duree)
+    nom_solveur, parametres = ALGORITHMES[algorithme]
+    debut = time.perf_counter()
+    _, distance = resoudre(nom_solveur, matrice, graine, controle, instrumentation=instrumentation,
+                           **parametres(len(matrice)))
+    return distance, time.perf_counter() - debut
+
+def mesurer_memoire(algorithme, matrice, graine, iterations):
+    # Même exécution (même graine, même nombre d'itérations) sous tracemalloc :
+    # pic des allocations faites pendant la résolution
+    tracemalloc.start()
+    try:
+        executer(algorithme, matrice, graine, Controle(iterations_max=iterations))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def lancer_banc(tailles=TAILLES, types_instances=TYPES_INSTANCES, algorithmes=tuple(ALGORITHMES),
+                repetitions=3, duree_max=10.0, graine=0, memoire=True, reference=None, journal=None):
+    """
+    Retourne la liste des résultats (un dictionnaire par exécution)
+    reference : {nom d'instance: meilleure distance connue} (optionnel)
+    journal : fichier où écrire la progression (ex: sys.stderr), None = silencieux
+    """
+    for algorithme in algorithmes:
+        if algorithme not in ALGORITHMES:
+            raise ValueError("Algorithme inconnu : %r (choix : %s)" % (algorithme, ", ".join(ALGORITHMES)))
+    reference = reference or {}
+    resultats = []
+    for type_instance in types_instances:
+        for n in tailles:
+            nom_instance, matrice = generer_instance(type_instance, n, graine)
+            for algorithme in algorithmes:
+                for repetition in range(repetitions):
+                    graine_execution = graine + repetition
+                    controle = Controle(duree_max)
+                    instrumentation = Instrumentation()
+                    distance, duree = executer(algorithme, matrice, graine_execution, controle, instrumentation)
+                    phases = instrumentation.statistiques()['phases']
+                    evaluations = phases['evaluation']['appels'] if 'evaluation' in phases else 0
+                    resultat = {
+                        'instance': nom_instance,
+                        'type': type_instance,
+                        'villes': n,
+                        'algorithme': algorithme,
+                        'graine': graine_execution,
+                        'distance': distance,
+                        'duree': duree,
+                        'iterations': controle.iterations,
+                        'evaluations': evaluations,
+                        'evaluations_par_seconde': evaluations / duree if duree > 0 else None,
+                        'arret': controle.raison,
+                    }
+                    if memoire:
+                        # Arrêt par le contrôle : le dernier appel à continuer() n'a pas fait d'itération
+                        iterations = controle.iterations - (controle.raison is not None)
+                        resultat['memoire_max'] = mesurer_memoire(algorithme, matrice, graine_execution, iterations)
+                    resultats.append(resultat)
+                    if journal is not None:
+                        print("%s %s graine=%d : %.1f en %.2f s" % (nom_instance, algorithme, graine_execution,
+                                                                   distance, duree), file=journal)
+
+    # Écart à la meilleure distance connue de chaque instance
+    meilleures = dict(reference)
+    for r in resultats:
+        if r['instance'] not in meilleures or r['distance'] < meilleures[r['instance']]:
+            meilleures[r['instance']] = r['distance']
+    for r in resultats:
+        r['meilleure_connue'] = meilleures[r['instance']]
+        r['ecart'] = 100 * (r['distance'] - r['meilleure_connue']) / r['meilleure_connue']
+    return resultats
+
+def description_machine():
+    return {
+        'python': platform.python_version(),
+        'plateforme': platform.platform(),
+        'processeurs': os.cpu_count(),
+    }
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Banc d'essai des algorithmes TSP")
+    parseur.add_argument('--tailles', type=int, nargs='+', default=list(TAILLES))
+    parseur.add_argument('--types', nargs='+', default=list(TYPES_INSTANCES), choices=sorted(GENERATEURS))
+    parseur.add_argument('--algorithmes', nargs='+', default=list(ALGORITHMES), choices=sorted(ALGORITHMES))
+    parseur.add_argument('--repetitions', type=int, default=3, help="graines par (instance, algorithme)")
+    parseur.add_argument('--duree-max', type=float, default=10.0, help="plafond par exécution, en secondes")
+    parseur.add_argument('--graine', type=int, default=0)
+    parseur.add_argument('--sans-memoire', action='store_true', help="ne pas mesurer le pic de mémoire")
+    parseur.add_argument('--reference', default=None, help="JSON {instance: meilleure distance connue}")
+    parseur.add_argument('--sortie', default=None, help="fichier JSON des résultats (défaut : sortie standard)")
+    options = parseur.parse_args(arguments)
+
+    reference = None
+    if options.reference:
+        with open(options.reference) as fichier:
+            reference = json.load(fichier)
+    resultats = lancer_banc(options.tailles, options.types, options.algorithmes, options.repetitions,
+                            options.duree_max, options.graine, not options.sans_memoire, reference,
+                            journal=sys.stderr)
+    rapport = {
+        'machine': description_machine(),
+        'parametres': vars(options),
+        'resultats': resultats,
+    }
+    if options.sortie:
+        with open(options.sortie, 'w') as fichier:
+            json.dump(rapport, fichier, indent=1)
+    else:
+        json.dump(rapport, sys.stdout, indent=1)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import hashlib
+from array import array
+from collections import OrderedDict
+
+# -----------------------------
+# Distance totale d'un circuit (parcours fermé) : le seul calcul complet d'une
+# longueur de parcours, partagé par le cache, les solveurs, la résolution
+# exacte et la réoptimisation incrémentale
+# -----------------------------
+
+def calculer_distance_totale(solution, matrice_distances):
+    """
+    Exemple : solution=[0,2,1] -> distance = 0->2 + 2->1 + 1->0
+    Parcours vide -> 0
+    """
+    if not solution:
+        return 0
+    distance = 0
+    for i in range(len(solution) - 1):
+        distance += matrice_distances[solution[i]][solution[i + 1]]
+    return distance + matrice_distances[solution[-1]][solution[0]]
+
+# -----------------------------
+# Cache des distances de parcours (LRU borné)
+# Un même parcours peut s'écrire de 2n façons : n rotations x 2 sens.
+# Ex : [0,1,2,3], [2,3,0,1] et [0,3,2,1] sont le même circuit.
+# La clé canonique commence par la plus petite ville et prend le sens où
+# la ville suivante est la plus petite des deux voisines : tous ces parcours
+# partagent donc la même entrée du cache.
+# Le sens n'est normalisé que si la matrice est symétrique : sinon un circuit
+# et son inverse n'ont pas la même longueur et gardent deux entrées distinctes.
+# Le cache stocke un condensé de 16 octets de la clé (BLAKE2b), pas le n-uplet :
+# une entrée occupe ~170 octets quelle que soit la taille de l'instance.
+# -----------------------------
+
+def est_symetrique(matrice_distances):
+    """
+    d(a,b) = d(b,a) pour tout couple ? Vérifié une fois, à la création du cache
+    Matrice paresseuse (distances calculées depuis les coordonnées) : toujours symétrique
+    """
+    if hasattr(matrice_distances, 'coordonnees'):
+        return True
+    matrice_np = matrice_distances.en_numpy() if hasattr(matrice_distances, 'en_numpy') else None
+    if matrice_np is not None:
+        return bool((matrice_np == matrice_np.T).all())
+    n = len(matrice_distances)
+    for a in range(n):
+        ligne = matrice_distances[a]
+        for b in range(a + 1, n):
+            if ligne[b] != matrice_distances[b][a]:
+                return False
+    return True
+
+def cle_canonique(solution, symetrique=True):
+    """
+    Exemple : [2,3,0,1] -> (0,1,2,3) et [0,3,2,1] -> (0,1,2,3)
+    symetrique=False : seule la rotation est normalisée, [0,3,2,1] -> (0,3,2,1)
+    """
+    n = len(solution)
+    if n < 3:
+        return tuple(sorted(solution))
+    k = solution.index(min(solution))
+    if not symetrique or solution[(k + 1) % n] <= solution[k - 1]:
+        return tuple(solution[k:]) + tuple(solution[:k])
+    # Sens inverse : on lit le parcours à reculons à partir de la position k
+    inverse = solution[k::-1] + solution[:k:-1]
+    return tuple(inverse)
+
+def condenser(cle):
+    # Condensé de taille fixe d'une clé canonique (collision : ~2^-64 pour 2^32 entrées)
+    return hashlib.blake2b(array('i', cle).tobytes(), digest_size=16).digest()
+
+class CacheDistances:
+    """
+    cache.distance(solution) : distance totale du circuit, calculée une seule fois
+    par parcours tant qu'il reste dans le cache
+    succes / echecs : compteurs de hits / misses
+    """
+    def __init__(self, matrice_distances, taille_max=100000, symetrique=None):
+        self.matrice = matrice_distances
+        # symetrique=None : vérifié sur la matrice (O(n²), une seule fois)
+        self.symetrique = est_symetrique(matrice_distances) if symetrique is None else symetrique
+        self.taille_max = taille_max
+        self.entrees = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+
+    def distance(self, solution):
+        cle = condenser(cle_canonique(solution, self.symetrique))
+        if cle in self.entrees:
+            self.succes += 1
+            self.entrees.move_to_end(cle)
+            return self.entrees[cle]
+        self.echecs += 1
+        valeur = calculer_distance_totale(solution, self.matrice)
+        self.entrees[cle] = valeur
+        if len(self.entrees) > self.taille_max:
+            self.entrees.popitem(last=False)  # on retire la plus ancienne entrée
+        return valeur
+
+    def statistiques(self):
+        total = self.succes + self.echecs
+        return {
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'taux_succes': self.succes / total if total else 0.0,
+            'taille': len(self.entrees),
+        }
@@ -0,0 +1,325 @@
+import math
+import mmap
+import os
+from array import array
+
+from instance import Instance, TYPES_VALEURS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel
+    np = None
+
+# -----------------------------
+# Chargement d'instances TSP sans matrice de listes Python
+#  - fichiers TSPLIB (.tsp) : coordonnées (NODE_COORD_SECTION) ou matrice explicite
+#  - matrice précalculée sur disque (binaire brut, ligne par ligne) ouverte en mmap :
+#    le système ne charge en mémoire que les pages réellement lues
+#  - matrice paresseuse : les distances sont calculées à la demande à partir
+#    des coordonnées (O(n) en mémoire, sans cache de lignes : un accès aléatoire
+#    m[a][b] ne réutilise presque jamais une ligne déjà calculée)
+# -----------------------------
+
+# -----------------------------
+# Distances TSPLIB (EDGE_WEIGHT_TYPE)
+# -----------------------------
+def _nint(x):
+    return int(x + 0.5)
+
+def distance_euc_2d(p, q):
+    return _nint(math.hypot(p[0] - q[0], p[1] - q[1]))
+
+def distance_ceil_2d(p, q):
+    return math.ceil(math.hypot(p[0] - q[0], p[1] - q[1]))
+
+def distance_att(p, q):
+    # Distance pseudo-euclidienne (instances att48, att532)
+    r = math.sqrt(((p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2) / 10.0)
+    t = _nint(r)
+    return t + 1 if t < r else t
+
+def _radians_geo(x):
+    degres = int(x)
+    return math.pi * (degres + 5.0 * (x - degres) / 3.0) / 180.0
+
+def distance_geo(p, q):
+    # Distance géographique TSPLIB (coordonnées en DDD.MM)
+    rrr = 6378.388
+    lat1, lon1 = _radians_geo(p[0]), _radians_geo(p[1])
+    lat2, lon2 = _radians_geo(q[0]), _radians_geo(q[1])
+    q1 = math.cos(lon1 - lon2)
+    q2 = math.cos(lat1 - lat2)
+    q3 = math.cos(lat1 + lat2)
+    return int(rrr * math.acos(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)) + 1.0)
+
+def distance_euclidienne(p, q):
+    # Distance réelle non arrondie (hors norme TSPLIB)
+    return math.hypot(p[0] - q[0], p[1] - q[1])
+
+DISTANCES = {
+    'EUC_2D': distance_euc_2d,
+    'CEIL_2D': distance_ceil_2d,
+    'ATT': distance_att,
+    'GEO': distance_geo,
+    'EUC': distance_euclidienne,
+}
+
+# Métriques planes : la grille de voisinage (plus_proches) est valable
+METRIQUES_PLANES = ('EUC_2D', 'CEIL_2D', 'ATT', 'EUC')
+
+# -----------------------------
+# Matrice paresseuse
+# -----------------------------
+class MatriceParesseuse:
+    """
+    Se comporte comme matrice_distances : len(m) et m[a][b]
+    Aucune matrice n x n n'est construite : m[a] renvoie une ligne virtuelle
+    qui calcule chaque distance à la demande en O(1).
+    Exemple : m = MatriceParesseuse([(0, 0), (3, 4)], 'EUC') -> m[0][1] = 5.0
+    """
+    def __init__(self, coordonnees, type_distance='EUC_2D'):
+        if type_distance not in DISTANCES:
+            raise ValueError("Type de distance inconnu : %r (choix : %s)" % (type_distance, ", ".join(DISTANCES)))
+        self.coordonnees = coordonnees
+        self.type_distance = type_distance
+        self.fonction = DISTANCES[type_distance]
+        self.grille = None
+
+    def __len__(self):
+        return len(self.coordonnees)
+
+    def __iter__(self):
+        # Parcours ligne par ligne (ex: Instance.depuis_matrice, partager_matrice)
+        for a in range(len(self.coordonnees)):
+            yield self[a]
+
+    def __getitem__(self, a):
+        return _LigneVirtuelle(self.fonction, self.coordonnees, a)
+
+    def distance(self, a, b):
+        return self.fonction(self.coordonnees[a], self.coordonnees[b])
+
+    def en_numpy(self):
+        # Pas de matrice NumPy dense : les algorithmes gardent le calcul à la demande
+        return None
+
+    def plus_proches(self, a, k):
+        """
+        Les k villes les plus proches de a, triées par distance
+        Métrique plane : recherche dans une grille par anneaux de cases, environ O(k)
+        Sinon : parcours complet de la ligne en O(n)
+        """
+        n = len(self.coordonnees)
+        k = min(k, n - 1)
+        if self.type_distance not in METRIQUES_PLANES:
+            autres = (b for b in range(n) if b != a)
+            return sorted(autres, key=lambda b: self.distance(a, b))[:k]
+        if self.grille is None:
+            self.grille = _Grille(self.coordonnees)
+        # Toutes ces métriques croissent avec la distance euclidienne : la grille
+        # classe les villes à la distance euclidienne, ce qui donne les mêmes voisins
+        coordonnees = self.coordonnees
+        return self.grille.plus_proches(a, k, lambda a, b: distance_euclidienne(coordonnees[a], coordonnees[b]))
+
+class _LigneVirtuelle:
+    # Créée à chaque m[a] : __slots__ et références directes (fonction, coordonnées,
+    # point a) pour que m[a][b] coûte un seul appel de la fonction de distance
+    __slots__ = ('fonction', 'coordonnees', 'point')
+
+    def __init__(self, fonction, coordonnees, a):
+        self.fonction = fonction
+        self.coordonnees = coordonnees
+        self.point = coordonnees[a]
+
+    def __getitem__(self, b):
+        return self.fonction(self.point, self.coordonnees[b])
+
+    def __iter__(self):
+        fonction, point = self.fonction, self.point
+        for q in self.coordonnees:
+            yield fonction(point, q)
+
+    def __len__(self):
+        return len(self.coordonnees)
+
+class _Grille:
+    """
+    Index spatial simple : les villes sont rangées dans des cases carrées
+    (environ 2 villes par case). Pour chercher les plus proches voisins, on
+    parcourt les anneaux de cases autour de la ville jusqu'à ce que l'anneau
+    suivant soit forcément plus loin que le k-ième voisin trouvé.
+    """
+    def __init__(self, coordonnees):
+        xs = [p[0] for p in coordonnees]
+        ys = [p[1] for p in coordonnees]
+        self.xmin, self.ymin = min(xs), min(ys)
+        largeur = max(max(xs) - self.xmin, max(ys) - self.ymin) or 1.0
+        self.nb_cases = max(1, int(math.sqrt(len(coordonnees) / 2)))
+        self.taille_case = largeur / self.nb_cases
+        self.coordonnees = coordonnees
+        self.cases = {}
+        for v, p in enumerate(coordonnees):
+            self.cases.setdefault(self._case(p), []).append(v)
+
+    def _case(self, p):
+        cx = min(int((p[0] - self.xmin) / self.taille_case), self.nb_cases - 1)
+        cy = min(int((p[1] - self.ymin) / self.taille_case), self.nb_cases - 1)
+        return cx, cy
+
+    def plus_proches(self, a, k, distance):
+        cx, cy = self._case(self.coordonnees[a])
+        candidats = []
+        rayon = 0
+        while True:
+            for x in range(cx - rayon, cx + rayon + 1):
+                for y in range(cy - rayon, cy + rayon + 1):
+                    # seulement le bord de l'anneau (l'intérieur est déjà vu)
+                    if max(abs(x - cx), abs(y - cy)) != rayon:
+                        continue
+                    for b in self.cases.get((x, y), ()):
+                        if b != a:
+                            candidats.append((distance(a, b), b))
+            # Toute ville hors des anneaux vus est à plus de rayon * taille_case
+            if len(candidats) >= k:
+                candidats.sort()
+                if candidats[k - 1][0] <= rayon * self.taille_case or rayon > self.nb_cases:
+                    return [b for _, b in candidats[:k]]
+            elif rayon > self.nb_cases:
+                candidats.sort()
+                return [b for _, b in candidats]
+            rayon += 1
+
+# -----------------------------
+# Matrice précalculée en mmap
+# -----------------------------
+def ecrire_matrice(matrice, chemin, type_valeurs='d'):
+    """
+    Écrit la matrice sur disque en binaire brut, sans en-tête
+    Écriture ligne par ligne : on n'a jamais plus d'une ligne en mémoire
+    """
+    with open(chemin, 'wb') as f:
+        for a in range(len(matrice)):
+            array(type_valeurs, matrice[a]).tofile(f)
+
+def charger_matrice_mappee(chemin, type_valeurs='d'):
+    """
+    Ouvre une matrice écrite par ecrire_matrice sans la lire en mémoire
+    Le nombre de villes est déduit de la taille du fichier
+    """
+    if type_valeurs not in TYPES_VALEURS:
+        raise ValueError("Type de valeurs inconnu : %r (choix : %s)" % (type_valeurs, ", ".join(TYPES_VALEURS)))
+    taille_valeur = array(type_valeurs).itemsize
+    taille = os.path.getsize(chemin)
+    n = math.isqrt(taille // taille_valeur)
+    if n * n * taille_valeur != taille:
+        raise ValueError("Taille de fichier incompatible avec une matrice carrée : %s" % chemin)
+    with open(chemin, 'rb') as f:
+        carte = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if np is not None:
+        donnees = np.frombuffer(carte, dtype=TYPES_VALEURS[type_valeurs])
+    else:
+        donnees = memoryview(carte).cast(type_valeurs)
+    instance = Instance(n, donnees)
+    instance.carte = carte  # garder le mmap ouvert tant que l'instance existe
+    # Pour rouvrir le même fichier ailleurs (processus du pool, voir parallele.preparer_pool)
+    instance.fichier = (chemin, type_valeurs)
+    return instance
+
+# -----------------------------
+# Lecture TSPLIB
+# -----------------------------
+def lire_tsplib(chemin):
+    """
+    Retourne (entete, coordonnees, poids)
+    entete : dict des mots-clés (NAME, DIMENSION, EDGE_WEIGHT_TYPE...)
+    coordonnees : liste de (x, y) ou None
+    poids : valeurs de EDGE_WEIGHT_SECTION (matrice explicite) ou None
+    """
+    entete = {}
+    coordonnees = None
+    poids = None
+    section = None
+    with open(chemin) as f:
+        for ligne in f:
+            ligne = ligne.strip()
+            if not ligne or ligne == 'EOF':
+                continue
+            if ligne in ('NODE_COORD_SECTION', 'EDGE_WEIGHT_SECTION', 'DISPLAY_DATA_SECTION', 'TOUR_SECTION'):
+                section = ligne
+                if section == 'NODE_COORD_SECTION':
+                    coordonnees = []
+                elif section == 'EDGE_WEIGHT_SECTION':
+                    poids = array('d')
+                continue
+            # Ligne d'en-tête "CLE : valeur" (les lignes de données n'ont pas de ':')
+            if ':' in ligne:
+                cle, valeur = ligne.split(':', 1)
+                entete[cle.strip()] = valeur.strip()
+                section = None
+                continue
+            if section == 'NODE_COORD_SECTION':
+                _, x, y = ligne.split()[:3]
+                coordonnees.append((float(x), float(y)))
+            elif section == 'EDGE_WEIGHT_SECTION':
+                poids.extend(float(v) for v in ligne.split())
+    return entete, coordonnees, poids
+
+def _matrice_explicite(n, poids, format_poids):
+    # Reconstruit la matrice complète dans un tampon plat array('d')
+    donnees = array('d', bytes(8 * n * n))
+    if format_poids == 'FULL_MATRIX':
+        donnees[:] = poids[:n * n]
+        return Instance(n, donnees)
+    k = 0
+    for a in range(n):
+        if format_poids == 'UPPER_ROW':
+            colonnes = range(a + 1, n)
+        elif format_poids == 'UPPER_DIAG_ROW':
+            colonnes = range(a, n)
+        elif format_poids == 'LOWER_ROW':
+            colonnes = range(a)
+        elif format_poids == 'LOWER_DIAG_ROW':
+            colonnes = range(a + 1)
+        else:
+            raise ValueError("EDGE_WEIGHT_FORMAT non supporté : %r" % format_poids)
+        for b in colonnes:
+            donnees[a * n + b] = donnees[b * n + a] = poids[k]
+            k += 1
+    return Instance(n, donnees)
+
+def charger_instance(chemin, mode='auto', seuil_dense=5000, type_valeurs='d'):
+    """
+    Charge une instance et retourne une matrice utilisable par tous les algorithmes
+    chemin : fichier TSPLIB (.tsp) ou matrice binaire brute (.bin, voir ecrire_matrice)
+    mode : 'dense' (Instance compacte), 'paresseuse' (calcul à la demande)
+           ou 'auto' (dense jusqu'à seuil_dense villes, paresseuse au-delà)
+    Exemple : matrice = charger_instance("pr2392.tsp")
+    """
+    if chemin.endswith('.bin'):
+        return charger_matrice_mappee(chemin, type_valeurs)
+    entete, coordonnees, poids = lire_tsplib(chemin)
+    n = int(entete['DIMENSION'])
+    type_distance = entete.get('EDGE_WEIGHT_TYPE', 'EUC_2D')
+    if type_distance == 'EXPLICIT':
+        return _matrice_explicite(n, poids, entete.get('EDGE_WEIGHT_FORMAT', 'FULL_MATRIX'))
+    if coordonnees is None:
+        raise ValueError("Aucune coordonnée (NODE_COORD_SECTION) dans %s" % chemin)
+    return matrice_depuis_coordonnees(coordonnees, type_distance, mode, seuil_dense, type_valeurs)
+
+def matrice_depuis_coordonnees(coordonnees, type_distance='EUC_2D', mode='auto', seuil_dense=5000,
+                               type_valeurs='d'):
+    """
+    Matrice des distances à partir d'une liste de coordonnées (mêmes modes que charger_instance)
+    Exemple : matrice_depuis_coordonnees([(0, 0), (3, 4), (6, 0)]) -> instance[0][1] = 5
+    """
+    n = len(coordonnees)
+    paresseuse = MatriceParesseuse(coordonnees, type_distance)
+    if mode == 'paresseuse' or (mode == 'auto' and n > seuil_dense):
+        return paresseuse
+    if mode not in ('dense', 'auto'):
+        raise ValueError("Mode inconnu : %r (choix : auto, dense, paresseuse)" % mode)
+    # Instance dense construite ligne par ligne, sans liste de listes intermédiaire
+    donnees = array(type_valeurs)
+    for a in range(n):
+        donnees.extend(paresseuse.distance(a, b) for b in range(n))
+    return Instance(n, donnees)
@@ -0,0 +1,261 @@
+import heapq
+import random
+
+from voisinage import listes_voisins
+
+# -----------------------------------------------
+# Tours initiaux construits (au lieu d'une permutation aléatoire)
+# Les algorithmes partent ainsi près d'un bon parcours :
+#   'aleatoire'          : permutation aléatoire (comportement d'origine)
+#   'plus_proche_voisin' : aller à la ville non visitée la plus proche,
+#                          cherchée d'abord dans les k plus proches voisins
+#   'glouton'            : arêtes les plus courtes d'abord (degré <= 2, sans cycle),
+#                          puis raccordement des morceaux
+#   'hilbert'            : villes triées le long d'une courbe de Hilbert
+#                          (demande les coordonnées)
+#   'insertion'          : insertion la moins chère
+# Chaque solveur accepte init=<nom> ou init=<parcours> (départ à chaud).
+# -----------------------------------------------
+
+def tour_aleatoire(matrice_distances):
+    tour = list(range(len(matrice_distances)))
+    random.shuffle(tour)
+    return tour
+
+def plus_proche_voisin(matrice_distances, depart=0, k_voisins=10, voisins=None):
+    """
+    Exemple : villes sur une ligne 0-1-2-3, depart=0 -> [0, 1, 2, 3]
+    voisins : listes de plus proches voisins déjà calculées (sinon calculées ici)
+    Si aucun des k voisins n'est libre, on parcourt toutes les villes restantes (O(n))
+    """
+    n = len(matrice_distances)
+    if voisins is None:
+        voisins = listes_voisins(matrice_distances, k_voisins)
+    libre = bytearray([1]) * n
+    restantes = set(range(n))
+    tour = [depart]
+    libre[depart] = 0
+    restantes.discard(depart)
+    ville = depart
+    while restantes:
+        suivante = next((b for b in voisins[ville] if libre[b]), None)
+        if suivante is None:
+            ligne = matrice_distances[ville]
+            suivante = min(restantes, key=lambda b: ligne[b])
+        tour.append(suivante)
+        libre[suivante] = 0
+        restantes.discard(suivante)
+        ville = suivante
+    return tour
+
+def glouton_aretes(matrice_distances, k_voisins=10):
+    """
+    Appariement glouton : on prend les arêtes candidates (k plus proches voisins)
+    de la plus courte à la plus longue, si les deux villes ont un degré < 2 et
+    ne sont pas déjà reliées (union-find). Les morceaux obtenus sont ensuite
+    raccordés en allant à chaque fois vers l'extrémité libre la plus proche.
+    """
+    n = len(matrice_distances)
+    if n < 3:
+        return list(range(n))
+    voisins = listes_voisins(matrice_distances, k_voisins)
+    aretes = set()
+    for a in range(n):
+        for b in voisins[a]:
+            aretes.add((a, b) if a < b else (b, a))
+    aretes = sorted(aretes, key=lambda arete: matrice_distances[arete[0]][arete[1]])
+
+    parent = list(range(n))
+
+    def racine(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    adjacents = [[] for _ in range(n)]
+    for a, b in aretes:
+        if len(adjacents[a]) < 2 and len(adjacents[b]) < 2:
+            ra, rb = racine(a), racine(b)
+            if ra != rb:
+                parent[ra] = rb
+                adjacents[a].append(b)
+                adjacents[b].append(a)
+
+    # Morceaux (chemins) : on part de chaque extrémité (degré < 2) non visitée
+    visite = bytearray(n)
+    morceaux = []
+    for a in range(n):
+        if len(adjacents[a]) < 2 and not visite[a]:
+            chemin = [a]
+            visite[a] = 1
+            precedente, ville = None, a
+            while True:
+                suivante = next((b for b in adjacents[ville] if b != precedente and not visite[b]), None)
+                if suivante is None:
+                    break
+                chemin.append(suivante)
+                visite[suivante] = 1
+                precedente, ville = ville, suivante
+            morceaux.append(chemin)
+
+    # Raccordement : depuis la fin du tour, vers l'extrémité libre la plus proche
+    tour = morceaux.pop()
+    while morceaux:
+        ligne = matrice_distances[tour[-1]]
+        meilleur, inverser, distance_min = 0, False, None
+        for k, chemin in enumerate(morceaux):
+            for fin, inverse in ((chemin[0], False), (chemin[-1], True)):
+                if distance_min is None or ligne[fin] < distance_min:
+                    meilleur, inverser, distance_min = k, inverse, ligne[fin]
+        chemin = morceaux.pop(meilleur)
+        tour.extend(reversed(chemin) if inverser else chemin)
+    return tour
+
+def _indice_hilbert(ordre, x, y):
+    # Position du point (x, y) le long de la courbe de Hilbert d'une grille 2^ordre x 2^ordre
+    d = 0
+    s = 1 << (ordre - 1)
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotation du quadrant
+        if ry == 0:
+            if rx == 1:
+                x = s - 1 - x
+                y = s - 1 - y
+            x, y = y, x
+        s >>= 1
+    return d
+
+def courbe_hilbert(coordonnees, ordre=16):
+    """
+    Villes triées selon leur position sur une courbe de Hilbert : deux villes
+    proches sur la courbe sont proches dans le plan. O(n log n), sans distances.
+    Exemple : les 4 coins d'un carré -> [(0,0), (0,1), (1,1), (1,0)] dans cet ordre
+    """
+    xs = [p[0] for p in coordonnees]
+    ys = [p[1] for p in coordonnees]
+    x0, y0 = min(xs), min(ys)
+    etendue = max(max(xs) - x0, max(ys) - y0) or 1
+    cote = (1 << ordre) - 1
+    cles = [
+        _indice_hilbert(ordre, int((x - x0) / etendue * cote), int((y - y0) / etendue * cote))
+        for x, y in zip(xs, ys)
+    ]
+    return sorted(range(len(coordonnees)), key=cles.__getitem__)
+
+def _plus_proches_parmi(matrice_distances, x, candidats, presentes, k):
+    # k plus proches voisins de x parmi les villes `candidats` (presentes : même ensemble)
+    if hasattr(matrice_distances, 'plus_proches'):
+        # Matrice paresseuse : index spatial, puis on ne garde que les villes concernées
+        return [b for b in matrice_distances.plus_proches(x, k) if b in presentes]
+    ligne = matrice_distances[x]
+    return heapq.nsmallest(k, (b for b in candidats if b != x), key=ligne.__getitem__)
+
+def inserer_villes(matrice_distances, tour, villes, k_voisins=10):
+    """
+    Insertion la moins chère : insère chaque ville de `villes` dans `tour`,
+    à chaque pas celle dont l'insertion coûte le moins, là où elle coûte le moins
+    Insérer x entre a et b coûte d(a,x) + d(x,b) - d(a,b)
+    Seules les arêtes qui touchent un des k plus proches voisins de x sont
+    examinées (toutes si aucun n'est encore dans le parcours) ; les insertions
+    possibles sont rangées dans un tas et revérifiées quand on les sort
+    (arête coupée entre-temps -> meilleure arête recalculée) : ~O(n·k log n)
+    Exemple : tour=[0, 2], villes=[1] (villes alignées 0-1-2) -> [0, 1, 2]
+    """
+    m = matrice_distances
+    villes = list(villes)
+    if not tour:
+        if not villes:
+            return []
+        tour = [villes.pop(0)]
+    # Parcours en liste doublement chaînée : insertion en O(1)
+    suivant = {a: b for a, b in zip(tour, tour[1:] + tour[:1])}
+    precedent = {b: a for a, b in suivant.items()}
+    a_inserer = set(villes)
+    candidats = list(suivant) + villes
+    presentes = set(candidats)
+    voisins = {x: _plus_proches_parmi(m, x, candidats, presentes, k_voisins) for x in villes}
+    # inverses[a] : villes à insérer qui ont a parmi leurs voisins
+    inverses = {}
+    for x, liste in voisins.items():
+        for a in liste:
+            if a in a_inserer:
+                inverses.setdefault(a, []).append(x)
+
+    def cout(x, a):
+        # Insertion de x sur l'arête (a, suivant[a])
+        b = suivant[a]
+        return m[a][x] + m[x][b] - m[a][b]
+
+    def meilleure_arete(x):
+        aretes = set()
+        for a in voisins[x]:
+            if a in suivant:
+                aretes.add(a)
+                aretes.add(precedent[a])
+        return min((cout(x, a), a) for a in (aretes or suivant))
+
+    tas = []
+    for x in villes:
+        c, a = meilleure_arete(x)
+        tas.append((c, x, a, suivant[a]))
+    heapq.heapify(tas)
+    while tas:
+        _, x, a, b = heapq.heappop(tas)
+        if x not in a_inserer:
+            continue
+        if suivant[a] != b:
+            # L'arête (a, b) a été coupée depuis : nouvelle meilleure arête
+            c, a = meilleure_arete(x)
+            heapq.heappush(tas, (c, x, a, suivant[a]))
+            continue
+        a_inserer.discard(x)
+        suivant[a], suivant[x] = x, b
+        precedent[b], precedent[x] = x, a
+        # Les villes voisines de x peuvent maintenant s'insérer sur (a, x) ou (x, b)
+        for y in inverses.get(x, ()):
+            if y in a_inserer:
+                for e in (a, x):
+                    heapq.heappush(tas, (cout(y, e), y, e, suivant[e]))
+    debut = tour[0]
+    resultat = [debut]
+    ville = suivant[debut]
+    while ville != debut:
+        resultat.append(ville)
+        ville = suivant[ville]
+    return resultat
+
+def insertion_moins_chere(matrice_distances, depart=0, k_voisins=10):
+    n = len(matrice_distances)
+    return inserer_villes(matrice_distances, [depart], (v for v in range(n) if v != depart), k_voisins)
+
+CONSTRUCTIONS = ('aleatoire', 'plus_proche_voisin', 'glouton', 'hilbert', 'insertion')
+
+def construire_tour(init, matrice_distances, k_voisins=10, coordonnees=None):
+    """
+    init : nom de construction (voir CONSTRUCTIONS) ou parcours déjà construit
+    coordonnees : nécessaires pour 'hilbert' (sinon prises sur une matrice paresseuse)
+    Exemple : construire_tour('glouton', matrice_distances)
+    """
+    if not isinstance(init, str):
+        tour = list(init)
+        if sorted(tour) != list(range(len(matrice_distances))):
+            raise ValueError("Le parcours initial doit contenir chaque ville une fois")
+        return tour
+    if init not in CONSTRUCTIONS:
+        raise ValueError("Construction inconnue : %r (choix : %s)" % (init, ", ".join(CONSTRUCTIONS)))
+    if init == 'aleatoire':
+        return tour_aleatoire(matrice_distances)
+    if init == 'plus_proche_voisin':
+        return plus_proche_voisin(matrice_distances, k_voisins=k_voisins)
+    if init == 'glouton':
+        return glouton_aretes(matrice_distances, k_voisins)
+    if init == 'hilbert':
+        coordonnees = coordonnees or getattr(matrice_distances, 'coordonnees', None)
+        if coordonnees is None:
+            raise ValueError("init='hilbert' demande les coordonnées des villes")
+        return courbe_hilbert(coordonnees)
+    return insertion_moins_chere(matrice_distances, k_voisins=k_voisins)
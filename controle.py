@@ -0,0 +1,111 @@
+import queue
+import threading
+import time
+
+# -----------------------------------------------
+# Contrôle commun des solveurs (recuit, tabou, GA, îles...)
+# Chaque solveur accepte controle=Controle(...) et, à chaque itération
+# (mouvement, itération taboue, génération ou époque), demande :
+#   controle.continuer() -> False si le budget de temps ou d'itérations est épuisé,
+#                           si la meilleure solution stagne depuis `patience`
+#                           itérations ou si l'arrêt a été demandé (controle.arreter())
+#   controle.signaler(solution, distance) -> à chaque nouvelle meilleure solution
+# Le solveur s'arrête alors proprement et retourne sa meilleure solution :
+# on obtient toujours un résultat, même avec 200 ms de budget.
+# -----------------------------------------------
+
+class Controle:
+    """
+    duree_max : budget en secondes (horloge murale), None = illimité
+    patience : nombre d'itérations sans amélioration avant l'arrêt, None = illimité
+    rappel : fonction(solution, distance, temps) appelée à chaque amélioration
+    iterations_max : nombre d'itérations avant l'arrêt, None = illimité
+                     (même travail quelle que soit la vitesse, ex: sous tracemalloc)
+    Exemple : Controle(duree_max=0.2, patience=5000, rappel=print)
+    """
+    def __init__(self, duree_max=None, patience=None, rappel=None, iterations_max=None):
+        self.duree_max = duree_max
+        self.patience = patience
+        self.rappel = rappel
+        self.iterations_max = iterations_max
+        self._arret_demande = False
+        self.demarrer()
+
+    def demarrer(self):
+        # Appelé par le solveur à son lancement : le budget part de là
+        self.debut = time.perf_counter()
+        self.echeance = None if self.duree_max is None else self.debut + self.duree_max
+        self.iterations = 0
+        self.sans_amelioration = 0
+        self.meilleure_solution = None
+        self.meilleure_distance = None
+        self.raison = None  # 'temps', 'iterations', 'stagnation' ou 'demande' si le contrôle a arrêté le solveur
+
+    def temps_ecoule(self):
+        return time.perf_counter() - self.debut
+
+    def arreter(self):
+        # Demande d'arrêt depuis l'extérieur (ex: autre thread), prise en compte à la prochaine itération
+        self._arret_demande = True
+
+    def continuer(self):
+        self.iterations += 1
+        self.sans_amelioration += 1
+        if self._arret_demande:
+            self.raison = 'demande'
+        elif self.patience is not None and self.sans_amelioration > self.patience:
+            self.raison = 'stagnation'
+        elif self.iterations_max is not None and self.iterations > self.iterations_max:
+            self.raison = 'iterations'
+        elif self.echeance is not None and time.perf_counter() >= self.echeance:
+            self.raison = 'temps'
+        return self.raison is None
+
+    def signaler(self, solution, distance):
+        """
+        Propose une solution ; retourne True si elle améliore la meilleure connue
+        (la stagnation repart alors de zéro et le rappel est appelé)
+        """
+        if self.meilleure_distance is not None and distance >= self.meilleure_distance:
+            return False
+        self.meilleure_solution = solution
+        self.meilleure_distance = distance
+        self.sans_amelioration = 0
+        if self.rappel is not None:
+            self.rappel(solution, distance, self.temps_ecoule())
+        return True
+
+def solutions_successives(solveur, *arguments, duree_max=None, patience=None, **parametres):
+    """
+    Générateur : lance le solveur dans un thread et produit chaque amélioration
+    dès qu'elle est trouvée, sous la forme (solution, distance, temps)
+    Arrêter l'itération (break) arrête aussi le solveur.
+    Exemple :
+        for solution, distance, temps in solutions_successives(tabu_search, matrice, 10**6, 20, duree_max=0.2):
+            print(temps, distance)
+    """
+    file = queue.Queue()
+    controle = Controle(duree_max, patience, rappel=lambda s, d, t: file.put((s[:], d, t)))
+    erreurs = []
+
+    def executer():
+        try:
+            solveur(*arguments, controle=controle, **parametres)
+        except BaseException as erreur:
+            erreurs.append(erreur)
+        finally:
+            file.put(None)  # fin du solveur
+
+    fil = threading.Thread(target=executer, daemon=True)
+    fil.start()
+    try:
+        while True:
+            element = file.get()
+            if element is None:
+                break
+            yield element
+    finally:
+        controle.arreter()
+        fil.join()
+    if erreurs:
+        raise erreurs[0]
@@ -0,0 +1,174 @@
+import random
+
+# -----------------------------
+# Crossovers pour l'algorithme génétique (TSP)
+# Chaque enfant est construit en O(n) : un masque bytearray "utilise"
+# remplace les tests "v not in enfant" et enfant.count(...) en O(n) chacun.
+# Tous les crossovers retournent une permutation valide (sans doublon).
+# -----------------------------
+
+def crossover_uniforme(p1, p2):
+    """
+    CrossOver uniforme :
+    Chaque position prend aléatoirement le gène de p1 ou p2
+    Les doublons sont remplacés par les villes manquantes (ordre de p1)
+    Exemple : p1=[0,1,2,3], p2=[3,2,1,0] -> tirage [0,2,2,3] -> enfant=[0,2,1,3]
+    """
+    size = len(p1)
+    enfant = [None]*size
+    utilise = bytearray(size)
+    for i in range(size):
+        v = p1[i] if random.random() < 0.5 else p2[i]
+        if not utilise[v]:
+            enfant[i] = v
+            utilise[v] = 1
+    # Correction des doublons
+    missing = iter([v for v in p1 if not utilise[v]])
+    for i in range(size):
+        if enfant[i] is None:
+            enfant[i] = next(missing)
+    return enfant
+
+def crossover_1point(p1, p2):
+    """
+    CrossOver 1 point :
+    Exemple : p1=[0,1,2,3], p2=[3,2,1,0], point=2 -> enfant=[0,1,3,2]
+    """
+    point = random.randint(1, len(p1)-1)
+    enfant = p1[:point]
+    utilise = bytearray(len(p1))
+    for v in enfant:
+        utilise[v] = 1
+    for v in p2:
+        if not utilise[v]:
+            enfant.append(v)
+    return enfant
+
+def crossover_2points(p1, p2):
+    """
+    CrossOver 2 points :
+    Exemple : p1=[0,1,2,3,4], p2=[4,3,2,1,0], pt1=1, pt2=3 -> enfant=[4,1,2,0,3]
+    """
+    size = len(p1)
+    pt1, pt2 = sorted(random.sample(range(1, size), 2))
+    enfant = [None]*size
+    enfant[pt1:pt2] = p1[pt1:pt2]
+    utilise = bytearray(size)
+    for v in p1[pt1:pt2]:
+        utilise[v] = 1
+    pos = pt2
+    for v in p2:
+        if not utilise[v]:
+            if pos >= size:
+                pos = 0
+            enfant[pos] = v
+            pos += 1
+    return enfant
+
+def crossover_ox(p1, p2):
+    """
+    Order Crossover (OX) :
+    Le segment [pt1, pt2[ de p1 est copié, les autres villes sont placées
+    dans l'ordre où elles apparaissent dans p2 en partant de pt2 (circulaire)
+    Exemple : p1=[0,1,2,3,4], p2=[4,3,2,1,0], pt1=1, pt2=3 -> enfant=[3,1,2,0,4]
+    """
+    size = len(p1)
+    pt1, pt2 = sorted(random.sample(range(1, size), 2))
+    enfant = [None]*size
+    enfant[pt1:pt2] = p1[pt1:pt2]
+    utilise = bytearray(size)
+    for v in p1[pt1:pt2]:
+        utilise[v] = 1
+    pos = pt2 % size
+    for k in range(size):
+        v = p2[(pt2 + k) % size]
+        if not utilise[v]:
+            enfant[pos] = v
+            pos = (pos + 1) % size
+    return enfant
+
+def crossover_pmx(p1, p2):
+    """
+    Partially Mapped Crossover (PMX) :
+    Le segment [pt1, pt2[ de p1 est copié, les autres positions viennent de p2 ;
+    si une ville de p2 est déjà dans le segment, on suit la correspondance
+    p1[k] <-> p2[k] du segment jusqu'à trouver une ville libre
+    Exemple : p1=[0,1,2,3,4], p2=[4,3,2,1,0], pt1=1, pt2=3 -> enfant=[4,1,2,3,0]
+    """
+    size = len(p1)
+    pt1, pt2 = sorted(random.sample(range(1, size), 2))
+    enfant = p2[:]
+    enfant[pt1:pt2] = p1[pt1:pt2]
+    # position de chaque ville dans p1 pour suivre la correspondance en O(1)
+    position_p1 = [0]*size
+    for k, v in enumerate(p1):
+        position_p1[v] = k
+    dans_segment = bytearray(size)
+    for v in p1[pt1:pt2]:
+        dans_segment[v] = 1
+    for i in list(range(pt1)) + list(range(pt2, size)):
+        v = p2[i]
+        while dans_segment[v]:
+            v = p2[position_p1[v]]
+        enfant[i] = v
+    return enfant
+
+def crossover_erx(p1, p2):
+    """
+    Edge Recombination Crossover (ERX) :
+    On construit la table des voisins de chaque ville dans p1 et p2, puis on
+    avance toujours vers le voisin libre qui a le moins de voisins restants ;
+    l'enfant conserve ainsi le plus possible d'arêtes des parents
+    """
+    size = len(p1)
+    aretes = [set() for _ in range(size)]
+    for p in (p1, p2):
+        for k in range(size):
+            a, b = p[k], p[(k + 1) % size]
+            aretes[a].add(b)
+            aretes[b].add(a)
+    # Villes libres : liste + position pour retirer / tirer au hasard en O(1)
+    libres = list(range(size))
+    position_libre = list(range(size))
+
+    def retirer(v):
+        k = position_libre[v]
+        dernier = libres[-1]
+        libres[k] = dernier
+        position_libre[dernier] = k
+        libres.pop()
+        for w in aretes[v]:
+            aretes[w].discard(v)
+
+    v = p1[0]
+    enfant = [v]
+    retirer(v)
+    while libres:
+        if aretes[v]:
+            v = min(aretes[v], key=lambda w: (len(aretes[w]), random.random()))
+        else:
+            v = random.choice(libres)
+        enfant.append(v)
+        retirer(v)
+    return enfant
+
+# -----------------------------
+# Choix du crossover : '1', '2', ... -> (nom, fonction)
+# -----------------------------
+CROISEMENTS = {
+    '1': ('Uniforme', crossover_uniforme),
+    '2': ('1-point', crossover_1point),
+    '3': ('2-points', crossover_2points),
+    '4': ('OX (order)', crossover_ox),
+    '5': ('PMX (partially mapped)', crossover_pmx),
+    '6': ('ERX (edge recombination)', crossover_erx),
+}
+
+def choisir_croisement(choix):
+    """
+    Retourne la fonction de crossover associée au choix ('1' à '6')
+    None si le choix est invalide
+    """
+    if choix in CROISEMENTS:
+        return CROISEMENTS[choix][1]
+    return None
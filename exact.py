@@ -0,0 +1,228 @@
+from array import array
+
+from cache_fitness import calculer_distance_totale
+from mouvements import np
+from tabu import tabu_search
+
+# -----------------------------------------------
+# Résolution exacte des petites instances (quelques dizaines de villes au plus)
+#  - Held-Karp : programmation dynamique sur les sous-ensembles de villes
+#    (masques de bits). dp[S][j] = plus court chemin partant de la ville 0,
+#    passant par toutes les villes de S et finissant en j. O(2^n · n²) en temps,
+#    O(2^n · n) en mémoire, stockée dans des tableaux plats (array / NumPy).
+#  - Séparation et évaluation (branch and bound) : parcours en profondeur des
+#    tours partiels, coupé dès que la borne inférieure dépasse le meilleur tour
+#    connu. Mémoire O(n), utile un peu au-delà de la limite de Held-Karp.
+# resoudre_exact choisit la méthode selon n. Matrice supposée symétrique pour la
+# borne du branch and bound ; Held-Karp accepte aussi une matrice asymétrique.
+# -----------------------------------------------
+
+# Nombre de villes max pour Held-Karp (avec NumPy : vectorisé par couches de masques)
+LIMITE_HELD_KARP = 20 if np is not None else 13
+# Instances routées automatiquement vers resoudre_exact par solveurs.resoudre
+# (résolues en quelques dizaines de millisecondes)
+LIMITE_AUTOMATIQUE = 16 if np is not None else 12
+
+def held_karp(matrice_distances):
+    """
+    Tour optimal par programmation dynamique, départ et arrivée en ville 0
+    Retourne (tour, distance)
+    Exemple : held_karp(matrice_distances) sur la matrice 10 villes des scripts -> distance 18
+    """
+    n = len(matrice_distances)
+    if n <= 3:
+        tour = list(range(n))
+        return tour, calculer_distance_totale(tour, matrice_distances)
+    if np is not None:
+        return _held_karp_numpy(matrice_distances)
+    return _held_karp_tableaux(matrice_distances)
+
+def _reconstruire(parent, N, n, dernier):
+    # Remonte les prédécesseurs depuis (ensemble complet, dernier) ; villes 1..n-1 = bits 0..N-1
+    tour = []
+    S = (1 << N) - 1
+    j = dernier
+    while j >= 0:
+        tour.append(j + 1)
+        precedent = int(parent[S * N + j])
+        S ^= 1 << j
+        j = precedent
+    tour.append(0)
+    tour.reverse()
+    return tour
+
+def _held_karp_tableaux(matrice_distances):
+    # Version sans NumPy : dp et parent dans deux tableaux plats de 2^N x N cases
+    n = len(matrice_distances)
+    N = n - 1
+    infini = float('inf')
+    lignes = [list(matrice_distances[a]) for a in range(n)]
+    dp = array('d', [infini]) * ((1 << N) * N)
+    parent = array('b', [-1]) * ((1 << N) * N)
+    for j in range(N):
+        dp[(1 << j) * N + j] = lignes[0][j + 1]
+    for S in range(1, 1 << N):
+        base = S * N
+        bits = [j for j in range(N) if S >> j & 1]
+        if len(bits) < 2:
+            continue
+        for j in bits:
+            precedent = S ^ (1 << j)
+            base_precedent = precedent * N
+            meilleur, argument = infini, -1
+            for k in bits:
+                if k != j:
+                    valeur = dp[base_precedent + k] + lignes[k + 1][j + 1]
+                    if valeur < meilleur:
+                        meilleur, argument = valeur, k
+            dp[base + j] = meilleur
+            parent[base + j] = argument
+    complet = ((1 << N) - 1) * N
+    dernier = min(range(N), key=lambda j: dp[complet + j] + lignes[j + 1][0])
+    tour = _reconstruire(parent, N, n, dernier)
+    return tour, calculer_distance_totale(tour, matrice_distances)
+
+def _held_karp_numpy(matrice_distances):
+    # Même récurrence, une couche de masques (même nombre de villes) à la fois :
+    # pour chaque ville j, toutes les lignes dp[S] avec j dans S sont calculées d'un coup
+    n = len(matrice_distances)
+    N = n - 1
+    D = np.array([[matrice_distances[a][b] for b in range(n)] for a in range(n)], dtype=np.float64)
+    masques = np.arange(1 << N, dtype=np.int64)
+    nombre_bits = np.zeros(1 << N, dtype=np.int8)
+    for j in range(N):
+        nombre_bits += ((masques >> j) & 1).astype(np.int8)
+    dp = np.full((1 << N, N), np.inf)
+    parent = np.full((1 << N, N), -1, dtype=np.int8)
+    for j in range(N):
+        dp[1 << j, j] = D[0, j + 1]
+    villes = D[1:, 1:]  # villes[k, j] = d(k+1, j+1)
+    for taille in range(2, N + 1):
+        couche = masques[nombre_bits == taille]
+        for j in range(N):
+            S = couche[(couche >> j) & 1 == 1]
+            precedents = S ^ (1 << j)
+            valeurs = dp[precedents] + villes[:, j]  # inf pour les k absents de precedents
+            k = valeurs.argmin(axis=1)
+            dp[S, j] = valeurs[np.arange(len(S)), k]
+            parent[S, j] = k
+    complet = (1 << N) - 1
+    dernier = int((dp[complet] + D[1:, 0]).argmin())
+    tour = _reconstruire(parent.reshape(-1), N, n, dernier)
+    return tour, calculer_distance_totale(tour, matrice_distances)
+
+def separation_evaluation(matrice_distances, borne_initiale=None, controle=None):
+    """
+    Branch and bound en profondeur à partir de la ville 0
+    Deux bornes inférieures pour un chemin partiel 0 -> ... -> w (villes restantes R) :
+      - rapide : longueur + (min1(0) + min1(w) + somme sur R de min1 + min2) / 2
+        (min1, min2 : deux plus petites arêtes de chaque ville, chaque arête du
+        tour est comptée pour ses deux extrémités)
+      - arbre couvrant : longueur + poids de l'arbre couvrant minimal de R + {w, 0}
+        (le reste du tour est un chemin de w à 0 passant par R, donc un arbre couvrant)
+      la seconde, en O(|R|²), n'est calculée que si la première ne suffit pas à couper
+    borne_initiale : (tour, distance) connu (sinon plus proche voisin amélioré
+                     par une courte recherche tabou 2-opt : une bonne borne coupe tôt)
+    controle : Controle (voir controle.py), vérifié à chaque nœud
+    Retourne (tour, distance, prouve) ; prouve=False si le contrôle a coupé la recherche
+    """
+    n = len(matrice_distances)
+    if n <= 3:
+        tour = list(range(n))
+        return tour, calculer_distance_totale(tour, matrice_distances), True
+    lignes = [list(matrice_distances[a]) for a in range(n)]
+    min1 = []
+    min2 = []
+    for a in range(n):
+        deux = sorted(lignes[a][b] for b in range(n) if b != a)[:2]
+        min1.append(deux[0])
+        min2.append(deux[1])
+    # Villes suivantes essayées de la plus proche à la plus lointaine
+    ordre = [sorted((b for b in range(n) if b != a), key=lignes[a].__getitem__) for a in range(n)]
+
+    if borne_initiale is None:
+        borne_initiale = tabu_search(matrice_distances, 20 * n, 10, voisinage='2opt',
+                                     init='plus_proche_voisin')
+    meilleur_tour, meilleure_distance = list(borne_initiale[0]), borne_initiale[1]
+    if meilleur_tour[0] != 0:
+        k = meilleur_tour.index(0)
+        meilleur_tour = meilleur_tour[k:] + meilleur_tour[:k]
+
+    chemin = [0]
+    visite = bytearray(n)
+    visite[0] = 1
+
+    def arbre_couvrant(w):
+        # Prim sur les villes non visitées + w + 0 (w vient d'être marquée visitée)
+        sommets = [a for a in range(n) if not visite[a]]
+        sommets.append(0)
+        cout = [lignes[w][a] for a in sommets]
+        poids = 0
+        while sommets:
+            k = min(range(len(sommets)), key=cout.__getitem__)
+            poids += cout[k]
+            a = sommets[k]
+            sommets[k] = sommets[-1]
+            cout[k] = cout[-1]
+            sommets.pop()
+            cout.pop()
+            ligne = lignes[a]
+            for i, b in enumerate(sommets):
+                if ligne[b] < cout[i]:
+                    cout[i] = ligne[b]
+        return poids
+
+    # somme_restante = somme sur les villes non visitées de (min1 + min2)
+    somme_restante = sum(min1[a] + min2[a] for a in range(1, n))
+    prouve = True
+
+    def explorer(longueur, somme_restante):
+        nonlocal meilleur_tour, meilleure_distance, prouve
+        if controle is not None and not controle.continuer():
+            prouve = False
+            return False
+        v = chemin[-1]
+        if len(chemin) == n:
+            total = longueur + lignes[v][0]
+            if total < meilleure_distance:
+                meilleur_tour, meilleure_distance = chemin[:], total
+                if controle is not None:
+                    controle.signaler(meilleur_tour, meilleure_distance)
+            return True
+        for w in ordre[v]:
+            if visite[w]:
+                continue
+            nouvelle_longueur = longueur + lignes[v][w]
+            nouvelle_somme = somme_restante - min1[w] - min2[w]
+            if nouvelle_longueur + (min1[0] + min1[w] + nouvelle_somme) / 2 >= meilleure_distance:
+                continue
+            visite[w] = 1
+            if nouvelle_longueur + arbre_couvrant(w) < meilleure_distance:
+                chemin.append(w)
+                continuer = explorer(nouvelle_longueur, nouvelle_somme)
+                chemin.pop()
+            else:
+                continuer = True
+            visite[w] = 0
+            if not continuer:
+                return False
+        return True
+
+    explorer(0, somme_restante)
+    return meilleur_tour, meilleure_distance, prouve
+
+def resoudre_exact(matrice_distances, controle=None):
+    """
+    Aiguillage : Held-Karp jusqu'à LIMITE_HELD_KARP villes, branch and bound au-delà
+    Retourne (tour, distance, prouve)
+    Exemple : resoudre_exact(matrice_distances) -> ([0, 1, 9, ...], 18, True)
+    """
+    n = len(matrice_distances)
+    if controle is not None:
+        controle.demarrer()
+    if n <= LIMITE_HELD_KARP:
+        tour, distance = held_karp(matrice_distances)
+        if controle is not None:
+            controle.signaler(tour, distance)
+        return tour, distance, True
+    return separation_evaluation(matrice_distances, controle=controle)
@@ -0,0 +1,414 @@
+import os
+import random
+import time
+from bisect import bisect_left, insort
+from itertools import chain
+
+import parallele
+from cache_fitness import CacheDistances, calculer_distance_totale
+from croisements import CROISEMENTS, choisir_croisement
+from mouvements import np, matrice_numpy
+from selection import SelectionRoulette, SelectionRang, ArbreFenwick, tirer_rang
+from voisinage import creer_voisinage
+from instrumentation import compter_cache
+from sauvegarde import compacter
+from construction import construire_tour
+
+# -----------------------------
+# Moteur GA réutilisable (mêmes étapes que roulette.py / rang.py) :
+# sélection -> crossover -> mutation, une génération à la fois.
+# Utilisé par roulette.py / rang.py et par le modèle en îles (iles.py),
+# où chaque île a sa propre sélection et son propre crossover.
+# Une génération se fait en deux temps :
+#  1. construire TOUS les enfants
+#  2. évaluer tout le lot d'un coup :
+#     'numpy' : une seule indexation NumPy sur la matrice P x n des parcours
+#     'pool'  : le lot est découpé entre les processus du pool (parallele.py),
+#               utile quand la distance est coûteuse (matrice paresseuse...)
+#     'cache' : un par un via le cache des distances
+# Élitisme : les nombre_elites meilleurs parents remplacent les pires enfants,
+# la meilleure solution n'est donc jamais perdue d'une génération à l'autre.
+# Mode 'stationnaire' : pas de nouvelle population, quelques enfants par étape
+# remplacent les pires individus (voir PopulationStationnaire plus bas).
+# -----------------------------
+
+SELECTIONS = {
+    'roulette': SelectionRoulette,
+    'rang': SelectionRang,
+}
+
+EVALUATIONS = ('auto', 'numpy', 'pool', 'cache')
+
+MODES = ('generationnel', 'stationnaire')
+
+class ConfigurationGA:
+    """
+    Paramètres d'une population
+    selection : 'roulette' ou 'rang'
+    croisement : '1' à '6' (voir croisements.CROISEMENTS)
+    type_mutation : 'echange', '2opt' ou 'oropt' (voir voisinage.py)
+    evaluation : 'auto' (numpy si disponible, sinon cache), 'numpy', 'pool' ou 'cache'
+    pool : pool de parallele.preparer_pool, obligatoire pour evaluation='pool'
+    instrumentation : Instrumentation (voir instrumentation.py) : sélection, crossover,
+                      mutation et évaluation sont alors chronométrés (optionnel)
+    """
+    def __init__(self, matrice_distances, selection='roulette', croisement='1', mutation_rate=0.2,
+                 type_mutation='echange', k_voisins=10, cache=None,
+                 nombre_elites=1, evaluation='auto', pool=None, instrumentation=None):
+        if selection not in SELECTIONS:
+            raise ValueError("Sélection inconnue : %r (choix : %s)" % (selection, ", ".join(SELECTIONS)))
+        if croisement not in CROISEMENTS:
+            raise ValueError("Croisement inconnu : %r (choix : %s)" % (croisement, ", ".join(CROISEMENTS)))
+        if evaluation not in EVALUATIONS:
+            raise ValueError("Évaluation inconnue : %r (choix : %s)" % (evaluation, ", ".join(EVALUATIONS)))
+        if evaluation == 'pool' and pool is None:
+            raise ValueError("evaluation='pool' demande un pool (parallele.preparer_pool)")
+        self.matrice = matrice_distances
+        self.nom_selection = selection
+        self.selection = SELECTIONS[selection]
+        self.croisement = choisir_croisement(croisement)
+        self.mutation_rate = mutation_rate
+        self.voisinage_mutation = creer_voisinage(type_mutation, matrice_distances, k_voisins)
+        self.cache = cache if cache is not None else CacheDistances(matrice_distances)
+        self.nombre_elites = nombre_elites
+        self.pool = pool
+        if evaluation in ('auto', 'numpy'):
+            # Une seule copie NumPy : celle du voisinage de mutation s'il en a une ('echange')
+            if hasattr(self.voisinage_mutation, 'matrice_np'):
+                self.matrice_np = self.voisinage_mutation.matrice_np
+            else:
+                self.matrice_np = matrice_numpy(matrice_distances)
+        else:
+            self.matrice_np = None
+        if evaluation == 'auto':
+            evaluation = 'numpy' if self.matrice_np is not None else 'cache'
+        elif evaluation == 'numpy' and self.matrice_np is None:
+            evaluation = 'cache'  # NumPy absent ou matrice paresseuse
+        self.evaluation = evaluation
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            self.tirer_parents = instrumentation.chronometrer('selection', self.tirer_parents)
+            self.croisement = instrumentation.chronometrer('croisement', self.croisement)
+            self.mutation = instrumentation.chronometrer('mutation', self.mutation)
+
+    def distance(self, solution):
+        return self.cache.distance(solution)
+
+    def fitness(self, solution):
+        return 1 / self.cache.distance(solution)
+
+    def mutation(self, solution):
+        if random.random() < self.mutation_rate:
+            return self.voisinage_mutation.muter(solution)
+        return solution[:]
+
+    def tirer_parents(self, population, distances):
+        # Table de sélection construite une fois, deux parents par enfant tirés d'un coup
+        selection = self.selection(population, [1 / d for d in distances])
+        return selection.tirer_lot(2 * len(population))
+
+def population_aleatoire(nombre_villes, population_size):
+    return [random.sample(range(nombre_villes), nombre_villes) for _ in range(population_size)]
+
+def population_construite(config, population_size, init, perturbations=3, coordonnees=None):
+    """
+    Population autour d'un tour construit (voir construction.py) : le tour lui-même,
+    puis des copies perturbées par `perturbations` mutations chacune (diversité)
+    init='aleatoire' : population entièrement aléatoire
+    coordonnees : coordonnées des villes, pour init='hilbert' sur une matrice dense
+    """
+    if init == 'aleatoire':
+        return population_aleatoire(len(config.matrice), population_size)
+    base = construire_tour(init, config.matrice, coordonnees=coordonnees)
+    population = [base]
+    while len(population) < population_size:
+        individu = base
+        for _ in range(perturbations):
+            individu = config.voisinage_mutation.muter(individu)
+        population.append(individu)
+    return population
+
+# -----------------------------
+# Évaluation groupée
+# -----------------------------
+def _evaluer_morceau(morceau):
+    # Dans un processus du pool : distances d'un morceau de la population
+    m = parallele._matrice_processus
+    return [calculer_distance_totale(solution, m) for solution in morceau]
+
+def evaluer_lot(population, config):
+    """
+    Distances de toute la population, dans le même ordre
+    Exemple (numpy) : T = parcours (P x n) -> D[T, T décalé d'une colonne].sum(axis=1)
+    """
+    if config.evaluation == 'numpy':
+        T = np.asarray(population, dtype=np.intp)
+        return config.matrice_np[T, np.roll(T, -1, axis=1)].sum(axis=1).tolist()
+    if config.evaluation == 'pool':
+        # Un morceau par cœur : peu de messages entre processus
+        nombre_morceaux = os.cpu_count() or 1
+        taille = -(-len(population) // nombre_morceaux)
+        morceaux = [population[k:k + taille] for k in range(0, len(population), taille)]
+        return list(chain.from_iterable(config.pool.map(_evaluer_morceau, morceaux)))
+    return [config.distance(ind) for ind in population]
+
+# -----------------------------
+# Générations
+# -----------------------------
+def construire_enfants(population, distances, config):
+    """
+    Tous les enfants d'une génération : table de sélection construite une fois,
+    parents tirés d'un coup, puis crossover + mutation (sans évaluation)
+    """
+    population_size = len(population)
+    parents = config.tirer_parents(population, distances)
+    return [
+        config.mutation(config.croisement(parents[2 * k], parents[2 * k + 1]))
+        for k in range(population_size)
+    ]
+
+def nouvelle_generation(population, distances, config):
+    """
+    Retourne (nouvelle_population, distances) ; distances[k] = distance de population[k]
+    """
+    enfants = construire_enfants(population, distances, config)
+    if config.instrumentation is not None:
+        debut = time.perf_counter()
+    distances_enfants = evaluer_lot(enfants, config)
+    if config.instrumentation is not None:
+        config.instrumentation.ajouter('evaluation', debut, len(enfants))
+    # Élitisme : les meilleurs parents prennent la place des pires enfants
+    e = min(config.nombre_elites, len(population))
+    if e > 0:
+        elites = sorted(range(len(population)), key=lambda k: distances[k])[:e]
+        pires = sorted(range(len(enfants)), key=lambda k: distances_enfants[k], reverse=True)[:e]
+        for k_elite, k_pire in zip(elites, pires):
+            enfants[k_pire] = population[k_elite]
+            distances_enfants[k_pire] = distances[k_elite]
+    return enfants, distances_enfants
+
+def evoluer(population, config, generations, distances=None, controle=None, reprise=None):
+    """
+    Fait évoluer la population ; retourne (population, distances)
+    distances : distances déjà connues de la population (sinon évaluées ici)
+    controle : Controle (voir controle.py), vérifié à chaque génération ;
+               la stagnation se compte alors en générations
+    reprise : PointReprise (voir sauvegarde.py), population sauvegardée toutes
+              les reprise.intervalle générations et reprise depuis le fichier s'il existe
+    """
+    debut = 0
+    etat = reprise.charger('genetique', len(config.matrice)) if reprise is not None else None
+    if etat is not None:
+        population = [list(tour) for tour in etat['population']]
+        distances = list(etat['distances'])
+        debut = etat['generation']
+        random.setstate(etat['aleatoire'])
+    if distances is None:
+        distances = evaluer_lot(population, config)
+
+    def sauver(generation):
+        reprise.sauver({
+            'algorithme': 'genetique',
+            'nombre_villes': len(config.matrice),
+            'generation': generation,
+            'population': [compacter(tour) for tour in population],
+            'distances': distances,
+            'aleatoire': random.getstate(),
+        })
+
+    if controle is not None:
+        controle.signaler(*meilleur_individu(population, distances))
+    instrumentation = config.instrumentation
+    if instrumentation is not None:
+        meilleure_distance = min(distances)
+    prochaine = generations
+    for generation in range(debut, generations):
+        if reprise is not None and generation > debut and reprise.a_sauver(generation):
+            sauver(generation)
+        if controle is not None and not controle.continuer():
+            prochaine = generation
+            break
+        population, distances = nouvelle_generation(population, distances, config)
+        if controle is not None:
+            controle.signaler(*meilleur_individu(population, distances))
+        if instrumentation is not None and min(distances) < meilleure_distance:
+            meilleure_distance = min(distances)
+            instrumentation.evenement('amelioration', iteration=generation, distance=meilleure_distance)
+    if reprise is not None:
+        sauver(max(prochaine, debut))
+    return population, distances
+
+# -----------------------------
+# GA stationnaire (steady-state)
+# La population est un tableau de taille fixe : chaque étape produit quelques
+# enfants, chacun prend la place du pire individu s'il est meilleur que lui
+# (le meilleur n'est donc jamais remplacé). Pas de copie de la population.
+# Le classement (distance, case) est tenu trié au fil des remplacements
+# (bisect), ce qui donne le pire en O(1) et le tirage par rang en O(1) ;
+# la roulette utilise un arbre de Fenwick des fitness, mis à jour en O(log P).
+# -----------------------------
+class PopulationStationnaire:
+    """
+    population : liste de P parcours, modifiés sur place lors des remplacements
+    distances : distances des parcours (même ordre)
+    selection : 'roulette' ou 'rang'
+    """
+    def __init__(self, population, distances, selection='rang'):
+        if selection not in SELECTIONS:
+            raise ValueError("Sélection inconnue : %r (choix : %s)" % (selection, ", ".join(SELECTIONS)))
+        # Chaque case doit avoir son propre parcours (remplacé sur place) :
+        # un parcours partagé entre deux cases (ex: après l'élitisme) est copié
+        vus = set()
+        for k, tour in enumerate(population):
+            if id(tour) in vus:
+                population[k] = tour[:]
+            vus.add(id(population[k]))
+        self.population = population
+        self.distances = list(distances)
+        self.classement = sorted((d, k) for k, d in enumerate(self.distances))
+        self.arbre = ArbreFenwick([1 / d for d in self.distances]) if selection == 'roulette' else None
+
+    def tirer(self):
+        # Indice (case) d'un parent
+        if self.arbre is not None:
+            return self.arbre.tirer()
+        return self.classement[tirer_rang(len(self.classement))][1]
+
+    def contient_distance(self, distance):
+        i = bisect_left(self.classement, (distance, -1))
+        return i < len(self.classement) and self.classement[i][0] == distance
+
+    def remplacer_pire(self, enfant, distance):
+        """
+        L'enfant prend la case du pire individu s'il est strictement meilleur
+        et si sa distance n'est pas déjà présente (évite les doublons du même circuit)
+        Retourne True si l'enfant a été inséré
+        """
+        if distance >= self.classement[-1][0] or self.contient_distance(distance):
+            return False
+        _, k = self.classement.pop()
+        self.population[k][:] = enfant  # recopie dans le parcours existant
+        self.distances[k] = distance
+        insort(self.classement, (distance, k))
+        if self.arbre is not None:
+            self.arbre.modifier(k, 1 / distance)
+        return True
+
+    def meilleur(self):
+        distance, k = self.classement[0]
+        return self.population[k], distance
+
+def evoluer_stationnaire(population, config, etapes, distances=None, enfants_par_etape=2, controle=None,
+                         reprise=None):
+    """
+    etapes : nombre d'étapes ; chaque étape crée enfants_par_etape enfants
+    controle : vérifié à chaque étape (la stagnation se compte en étapes)
+    reprise : PointReprise (voir sauvegarde.py) ; seuls les parcours (compactés) et
+              les distances sont sauvegardés, le classement et l'arbre de la
+              roulette sont reconstruits à la reprise
+    Retourne (population, distances) ; la population est modifiée sur place
+    """
+    debut = 0
+    sauvegarde = reprise.charger('genetique_stationnaire', len(config.matrice)) if reprise is not None else None
+    if sauvegarde is not None:
+        population = [list(tour) for tour in sauvegarde['population']]
+        etat = PopulationStationnaire(population, sauvegarde['distances'], config.nom_selection)
+        debut = sauvegarde['etape']
+        random.setstate(sauvegarde['aleatoire'])
+    else:
+        if distances is None:
+            distances = evaluer_lot(population, config)
+        etat = PopulationStationnaire(population, distances, config.nom_selection)
+
+    def sauver(etape):
+        # L'arbre est reconstruit ici comme il le sera à la reprise (mêmes arrondis) :
+        # la suite des tirages est identique avec ou sans interruption
+        if etat.arbre is not None:
+            etat.arbre.construire([1 / d for d in etat.distances])
+        reprise.sauver({
+            'algorithme': 'genetique_stationnaire',
+            'nombre_villes': len(config.matrice),
+            'etape': etape,
+            'population': [compacter(tour) for tour in population],
+            'distances': etat.distances,
+            'aleatoire': random.getstate(),
+        })
+
+    instrumentation = config.instrumentation
+    tirer = etat.tirer
+    distance = config.distance
+    if instrumentation is not None:
+        tirer = instrumentation.chronometrer('selection', tirer)
+        distance = instrumentation.chronometrer('evaluation', distance)
+    meilleure_distance = etat.meilleur()[1]
+    if controle is not None:
+        controle.signaler(*etat.meilleur())
+    prochaine = etapes
+    for etape in range(debut, etapes):
+        if reprise is not None and etape > debut and reprise.a_sauver(etape):
+            sauver(etape)
+        if controle is not None and not controle.continuer():
+            prochaine = etape
+            break
+        for _ in range(enfants_par_etape):
+            enfant = config.mutation(config.croisement(population[tirer()], population[tirer()]))
+            etat.remplacer_pire(enfant, distance(enfant))
+        if etat.classement[0][0] < meilleure_distance:
+            meilleure_distance = etat.classement[0][0]
+            if controle is not None:
+                controle.signaler(etat.meilleur()[0][:], meilleure_distance)
+            if instrumentation is not None:
+                instrumentation.evenement('amelioration', iteration=etape, distance=meilleure_distance)
+    if reprise is not None:
+        sauver(max(prochaine, debut))
+    return population, etat.distances
+
+def meilleur_individu(population, distances):
+    k = min(range(len(population)), key=lambda k: distances[k])
+    return population[k], distances[k]
+
+def algorithme_genetique(matrice_distances, population_size=20, generations=200, selection='roulette',
+                         croisement='1', mutation_rate=0.2, type_mutation='echange', k_voisins=10,
+                         nombre_elites=1, evaluation='auto', processus=None, controle=None, instrumentation=None,
+                         mode='generationnel', enfants_par_etape=2, reprise=None, init='aleatoire',
+                         coordonnees=None):
+    """
+    GA complet sur une seule population
+    evaluation='pool' : crée un pool de processus (processus = nombre de cœurs par défaut)
+    mode : 'generationnel' (nouvelle population à chaque génération) ou 'stationnaire'
+           (enfants_par_etape enfants par étape, même nombre total d'enfants :
+           generations * population_size)
+    controle : Controle (voir controle.py) pour un budget de temps, un arrêt sur
+               stagnation ou un rappel à chaque amélioration (optionnel)
+    instrumentation : Instrumentation (voir instrumentation.py), mesures par phase (optionnel)
+    reprise : PointReprise (voir sauvegarde.py) pour sauvegarder et reprendre la recherche
+    init : population initiale aléatoire ('aleatoire') ou autour d'un tour construit
+           ('plus_proche_voisin', 'glouton', 'hilbert', 'insertion' ou un parcours)
+    coordonnees : coordonnées des villes, pour init='hilbert' sur une matrice dense
+    Retourne (meilleure_solution, meilleure_distance)
+    """
+    if mode not in MODES:
+        raise ValueError("Mode inconnu : %r (choix : %s)" % (mode, ", ".join(MODES)))
+    if controle is not None:
+        controle.demarrer()
+    pool, segment = (None, None)
+    if evaluation == 'pool':
+        pool, segment = parallele.preparer_pool(matrice_distances, processus)
+    try:
+        config = ConfigurationGA(matrice_distances, selection, croisement, mutation_rate, type_mutation,
+                                 k_voisins, nombre_elites=nombre_elites, evaluation=evaluation, pool=pool,
+                                 instrumentation=instrumentation)
+        population = population_construite(config, population_size, init, coordonnees=coordonnees)
+        if mode == 'stationnaire':
+            etapes = generations * population_size // enfants_par_etape
+            population, distances = evoluer_stationnaire(population, config, etapes,
+                                                         enfants_par_etape=enfants_par_etape, controle=controle,
+                                                         reprise=reprise)
+        else:
+            population, distances = evoluer(population, config, generations, controle=controle, reprise=reprise)
+        if instrumentation is not None:
+            compter_cache(instrumentation, config.cache, 0, 0)
+    finally:
+        if pool is not None:
+            parallele.liberer_pool(pool, segment)
+    return meilleur_individu(population, distances)
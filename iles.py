@@ -0,0 +1,127 @@
+import random
+
+import parallele
+from genetique import ConfigurationGA, evoluer, meilleur_individu
+
+# -----------------------------
+# Algorithme génétique en îles
+# K sous-populations évoluent en parallèle (une tâche par île dans le pool de
+# processus de parallele.py, matrice en mémoire partagée). Chaque île a sa
+# propre sélection (roulette ou rang) et son propre crossover.
+# Toutes les intervalle_migration générations, les meilleurs individus de
+# chaque île remplacent les pires d'une autre île :
+#   'anneau'    : île i -> île i+1 (la dernière envoie à la première)
+#   'aleatoire' : île i -> une autre île tirée au hasard
+# -----------------------------
+
+TOPOLOGIES = ('anneau', 'aleatoire')
+
+# Configurations déjà construites dans ce processus (listes de voisins, cache)
+_configurations_processus = {}
+
+def _evoluer_ile(population, parametres, generations, graine):
+    # Évolution d'une île pendant quelques générations, dans un processus du pool
+    random.seed(graine)
+    cle = tuple(sorted(parametres.items()))
+    if cle not in _configurations_processus:
+        _configurations_processus[cle] = ConfigurationGA(parallele._matrice_processus, **parametres)
+    config = _configurations_processus[cle]
+    population, distances = evoluer(population, config, generations)
+    meilleure_solution, meilleure_distance = meilleur_individu(population, distances)
+    # Distances renvoyées avec la population : la migration n'a rien à recalculer
+    return population, distances, meilleure_solution, meilleure_distance
+
+def destinations_migration(nombre_iles, topologie, rng):
+    """
+    destinations[i] = île qui reçoit les migrants de l'île i
+    Exemple : anneau, 3 îles -> [1, 2, 0]
+    """
+    if topologie == 'anneau':
+        return [(i + 1) % nombre_iles for i in range(nombre_iles)]
+    return [rng.choice([j for j in range(nombre_iles) if j != i]) for i in range(nombre_iles)]
+
+def algorithme_genetique_iles(matrice_distances, nombre_iles, taille_ile, generations,
+                              intervalle_migration=10, nombre_migrants=2, topologie='anneau',
+                              selections=('roulette', 'rang'), croisements=('1', '2', '3'),
+                              mutation_rate=0.2, type_mutation='echange', k_voisins=10,
+                              nombre_elites=1, processus=None, graine=None, controle=None):
+    """
+    selections / croisements : répartis en boucle sur les îles
+    Exemple : 4 îles, selections=('roulette', 'rang') -> roulette, rang, roulette, rang
+    controle : Controle (voir controle.py), vérifié entre deux époques ;
+               la stagnation se compte alors en époques
+    Retourne (meilleure_solution, meilleure_distance, statistiques)
+    statistiques : meilleure distance de chaque île après chaque époque
+    """
+    if topologie not in TOPOLOGIES:
+        raise ValueError("Topologie inconnue : %r (choix : %s)" % (topologie, ", ".join(TOPOLOGIES)))
+    if controle is not None:
+        controle.demarrer()
+    rng = random.Random(graine)
+    n = len(matrice_distances)
+    parametres_iles = [
+        {
+            'selection': selections[i % len(selections)],
+            'croisement': croisements[i % len(croisements)],
+            'mutation_rate': mutation_rate,
+            'type_mutation': type_mutation,
+            'k_voisins': k_voisins,
+            'nombre_elites': nombre_elites,
+        }
+        for i in range(nombre_iles)
+    ]
+    iles = []
+    for _ in range(nombre_iles):
+        iles.append([rng.sample(range(n), n) for _ in range(taille_ile)])
+
+    meilleure_solution, meilleure_distance = None, None
+    historique = []
+    pool, segment = parallele.preparer_pool(matrice_distances, processus)
+    try:
+        generations_faites = 0
+        while generations_faites < generations:
+            if controle is not None and not controle.continuer():
+                break
+            epoque = min(intervalle_migration, generations - generations_faites)
+            futures = [
+                pool.submit(_evoluer_ile, iles[i], parametres_iles[i], epoque, rng.randrange(2 ** 31))
+                for i in range(nombre_iles)
+            ]
+            resultats = [f.result() for f in futures]
+            generations_faites += epoque
+
+            distances_iles = []
+            for i, (population, distances, solution, distance) in enumerate(resultats):
+                iles[i] = population
+                distances_iles.append(distances)
+                if meilleure_distance is None or distance < meilleure_distance:
+                    meilleure_solution, meilleure_distance = solution, distance
+            if controle is not None:
+                controle.signaler(meilleure_solution, meilleure_distance)
+            historique.append([r[3] for r in resultats])
+
+            # Migration : les meilleurs de l'île i remplacent les pires de sa destination
+            if nombre_iles > 1 and generations_faites < generations:
+                migrants = []
+                for i in range(nombre_iles):
+                    ordre = sorted(range(taille_ile), key=lambda k: distances_iles[i][k])
+                    migrants.append([iles[i][k][:] for k in ordre[:nombre_migrants]])
+                # Places libres de chaque île, de la pire à la meilleure : si plusieurs
+                # îles envoient vers la même destination ('aleatoire'), les migrants
+                # suivants prennent les places suivantes au lieu d'écraser les premiers
+                places = {}
+                for i, j in enumerate(destinations_migration(nombre_iles, topologie, rng)):
+                    if j not in places:
+                        places[j] = sorted(range(taille_ile), key=lambda k: distances_iles[j][k], reverse=True)
+                    for migrant in migrants[i]:
+                        if not places[j]:
+                            break
+                        iles[j][places[j].pop(0)] = migrant
+    finally:
+        parallele.liberer_pool(pool, segment)
+
+    statistiques = {
+        'iles': [dict(p) for p in parametres_iles],
+        'historique': historique,
+    }
+    return meilleure_solution, meilleure_distance, statistiques
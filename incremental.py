@@ -0,0 +1,293 @@
+import hashlib
+import heapq
+from array import array
+from collections import OrderedDict, deque
+
+from cache_fitness import calculer_distance_totale
+from voisinage import DeuxOpt, OrOpt
+from construction import inserer_villes
+from solveurs import resoudre
+
+# -----------------------------------------------
+# Réoptimisation incrémentale : quelques villes ajoutées ou retirées d'un
+# parcours déjà résolu, sans tout recommencer.
+#   1. réparation : les villes retirées sont enlevées du parcours, les villes
+#      ajoutées (ou dont la ligne de distances a changé) sont insérées là où
+#      elles coûtent le moins (construction.inserer_villes) ;
+#   2. recherche locale autour de la zone touchée : 2-opt et Or-opt, limités
+#      aux k plus proches voisins des villes touchées. Une ville n'est
+#      réexaminée que si un mouvement a modifié une de ses arêtes (file de
+#      travail), le reste du parcours n'est pas parcouru.
+# Les villes gardent leur numéro (indice dans la matrice) : une ville retirée
+# reste dans la matrice mais n'est plus dans le parcours, qui peut donc ne
+# couvrir qu'une partie des villes de la matrice.
+# CacheTours mémorise les parcours résolus par empreinte d'instance : la même
+# instance (mêmes villes, mêmes distances) n'est jamais résolue deux fois.
+# L'empreinte complète de la matrice (O(n²)) n'est calculée qu'une fois par
+# matrice ; ensuite chaque remplacement de lignes la fait évoluer à partir des
+# seules lignes modifiées, et la clé d'un parcours ne hache que ses numéros de villes.
+# -----------------------------------------------
+
+def empreinte(matrice_distances, villes=None):
+    """
+    Empreinte (hachage SHA-1) de l'instance restreinte aux villes données
+    (toutes par défaut) : numéros des villes et distances entre elles, ou
+    coordonnées pour une matrice paresseuse (chargement.py), sans calculer n² distances
+    Exemple : empreinte(matrice) == empreinte([ligne[:] for ligne in matrice]) -> True
+    """
+    villes = sorted(range(len(matrice_distances)) if villes is None else villes)
+    h = hashlib.sha1(array('i', villes).tobytes())
+    coordonnees = getattr(matrice_distances, 'coordonnees', None)
+    if coordonnees is not None:
+        h.update(matrice_distances.type_distance.encode())
+        for a in villes:
+            h.update(array('d', coordonnees[a]).tobytes())
+    else:
+        for a in villes:
+            ligne = matrice_distances[a]
+            h.update(array('d', [ligne[b] for b in villes]).tobytes())
+    return h.hexdigest()
+
+class CacheTours:
+    """
+    Parcours résolus par empreinte d'instance (LRU borné, comme CacheDistances)
+    La matrice ne doit être modifiée que par reoptimiser(lignes=...) (ou
+    remplacer_lignes suivi de cache.lignes_remplacees) pour que les clés suivent
+    Exemple :
+        cache = CacheTours()
+        cache.enregistrer(cache.cle(matrice), tour, distance)
+        cache.obtenir(cache.cle(matrice)) -> (tour, distance)
+    """
+    def __init__(self, taille_max=64):
+        self.taille_max = taille_max
+        self.entrees = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+        # id(matrice) -> [matrice, empreinte courante] ; garder la matrice
+        # empêche un autre objet de réutiliser le même id. LRU borné comme les
+        # entrées : une matrice oubliée sera simplement réempreintée (O(n²))
+        self.matrices = OrderedDict()
+
+    def empreinte_matrice(self, matrice_distances):
+        # Empreinte complète calculée au premier appel seulement
+        entree = self.matrices.get(id(matrice_distances))
+        if entree is None or entree[0] is not matrice_distances:
+            entree = self.matrices[id(matrice_distances)] = [matrice_distances, empreinte(matrice_distances)]
+        self.matrices.move_to_end(id(matrice_distances))
+        if len(self.matrices) > self.taille_max:
+            self.matrices.popitem(last=False)
+        return entree[1]
+
+    def lignes_remplacees(self, matrice_distances, lignes):
+        # Nouvelle empreinte = hachage de l'ancienne et des lignes remplacées (O(n) par ligne)
+        h = hashlib.sha1(self.empreinte_matrice(matrice_distances).encode())
+        for ville in sorted(lignes):
+            h.update(array('i', [ville]).tobytes())
+            h.update(array('d', lignes[ville]).tobytes())
+        self.matrices[id(matrice_distances)][1] = h.hexdigest()
+
+    def cle(self, matrice_distances, villes=None):
+        """
+        Clé d'une instance : empreinte de la matrice + numéros des villes du parcours
+        (toutes par défaut), en O(k log k) pour k villes une fois la matrice connue
+        """
+        villes = sorted(range(len(matrice_distances)) if villes is None else villes)
+        h = hashlib.sha1(self.empreinte_matrice(matrice_distances).encode())
+        h.update(array('i', villes).tobytes())
+        return h.hexdigest()
+
+    def obtenir(self, cle):
+        # (tour, distance) ou None ; le tour rendu est une copie
+        if cle not in self.entrees:
+            self.echecs += 1
+            return None
+        self.succes += 1
+        self.entrees.move_to_end(cle)
+        tour, distance = self.entrees[cle]
+        return list(tour), distance
+
+    def enregistrer(self, cle, tour, distance):
+        self.entrees[cle] = (array('i', tour), distance)
+        self.entrees.move_to_end(cle)
+        if len(self.entrees) > self.taille_max:
+            self.entrees.popitem(last=False)
+
+def remplacer_lignes(matrice_distances, lignes):
+    """
+    Remplace sur place des lignes d'une matrice liste de listes, en gardant la
+    symétrie (la colonne de la ville est mise à jour aussi)
+    lignes : {ville: ligne complète} ; ville == len(matrice) ajoute une ville
+    (les villes nouvelles doivent être numérotées à la suite, sans trou)
+    """
+    for ville in sorted(lignes):
+        if ville > len(matrice_distances):
+            raise ValueError("Ville %d : les villes ajoutées doivent suivre la dernière (%d)"
+                             % (ville, len(matrice_distances) - 1))
+        if ville == len(matrice_distances):
+            matrice_distances.append(None)
+    n = len(matrice_distances)
+    for ville, ligne in lignes.items():
+        if len(ligne) != n:
+            raise ValueError("Ligne de la ville %d : %d distances pour %d villes" % (ville, len(ligne), n))
+        matrice_distances[ville] = list(ligne)
+    for a in range(n):
+        if len(matrice_distances[a]) < n:
+            matrice_distances[a].extend([0] * (n - len(matrice_distances[a])))
+    for ville, ligne in lignes.items():
+        for b in range(n):
+            matrice_distances[b][ville] = ligne[b]
+    return matrice_distances
+
+def reparer(matrice_distances, tour, ajoutees=(), retirees=()):
+    """
+    Enlève les villes retirées et insère les villes ajoutées au moindre coût
+    Retourne (nouveau tour, villes touchées) ; les villes touchées sont les
+    villes insérées et les anciennes voisines des villes retirées (reliées
+    maintenant par une nouvelle arête)
+    Exemple : villes alignées, tour=[0, 1, 3], ajoutees=[2] -> ([0, 1, 2, 3], {2})
+    """
+    retirees = set(retirees)
+    presentes = set(tour)
+    touchees = set()
+    if retirees:
+        n = len(tour)
+        for k, ville in enumerate(tour):
+            if ville in retirees:
+                touchees.add(tour[k - 1])
+                touchees.add(tour[(k + 1) % n])
+        tour = [ville for ville in tour if ville not in retirees]
+        touchees -= retirees
+    ajoutees = [ville for ville in dict.fromkeys(ajoutees) if ville not in presentes or ville in retirees]
+    tour = inserer_villes(matrice_distances, tour, ajoutees)
+    touchees.update(ajoutees)
+    return tour, touchees
+
+def optimiser_localement(matrice_distances, tour, touchees, k_voisins=10, longueur_max=3, max_mouvements=None):
+    """
+    2-opt et Or-opt autour des villes touchées, jusqu'à ce qu'aucun mouvement
+    n'améliore plus le parcours près d'elles (ou max_mouvements appliqués)
+    Le tour est modifié sur place ; retourne le nombre de mouvements appliqués
+    Pour chaque ville a de la file, on essaie de créer une arête (a, c) vers
+    un de ses k plus proches voisins c (dans le parcours), et on applique le
+    meilleur mouvement s'il raccourcit le parcours
+    """
+    m = matrice_distances
+    n = len(tour)
+    if n < 5:
+        return 0
+    # Les deux voisinages travaillent sur la même liste et le même tableau de positions
+    deux_opt = DeuxOpt(m)
+    or_opt = OrOpt(m, longueur_max=longueur_max)
+    deux_opt.preparer(tour)
+    or_opt.solution = tour
+    or_opt.positions = positions = deux_opt.positions
+    dans_tour = bytearray(len(m))
+    for ville in tour:
+        dans_tour[ville] = 1
+    k = min(k_voisins, n - 1)
+    voisins = {}
+
+    def plus_proches(a):
+        # k plus proches voisins de a parmi les villes du parcours (calculés à la demande)
+        if a not in voisins:
+            if hasattr(m, 'plus_proches'):
+                candidats = m.plus_proches(a, min(len(m) - 1, k + len(m) - n))
+                voisins[a] = [b for b in candidats if dans_tour[b]][:k]
+            else:
+                ligne = m[a]
+                voisins[a] = heapq.nsmallest(k, (b for b in tour if b != a), key=lambda b: ligne[b])
+        return voisins[a]
+
+    def meilleur_mouvement(a):
+        meilleur = None
+        i = positions[a]
+        for c in plus_proches(a):
+            j = positions[c]
+            # 2-opt : les deux inversions qui créent l'arête (a, c)
+            for mouvement in (tuple(sorted((i, j))), tuple(sorted(((i - 1) % n, (j - 1) % n)))):
+                if deux_opt._valide(*mouvement):
+                    delta = deux_opt.delta(mouvement)
+                    if meilleur is None or delta < meilleur[0]:
+                        meilleur = (delta, deux_opt, mouvement)
+            # Or-opt : le segment qui commence par a, placé juste après c
+            for longueur in range(1, longueur_max + 1):
+                mouvement = (i, longueur, j)
+                if or_opt._valide(*mouvement):
+                    delta = or_opt.delta(mouvement)
+                    if meilleur is None or delta < meilleur[0]:
+                        meilleur = (delta, or_opt, mouvement)
+        return meilleur
+
+    file = deque(touchees)
+    en_attente = set(touchees)
+    mouvements = 0
+    while file and (max_mouvements is None or mouvements < max_mouvements):
+        a = file.popleft()
+        en_attente.discard(a)
+        meilleur = meilleur_mouvement(a)
+        # Tolérance : pas de boucle sans fin sur des gains dus aux arrondis
+        if meilleur is None or meilleur[0] >= -1e-9:
+            continue
+        _, voisinage, mouvement = meilleur
+        extremites = voisinage._villes(mouvement)
+        voisinage.appliquer(mouvement)
+        mouvements += 1
+        for ville in extremites + (a,):
+            if ville not in en_attente:
+                en_attente.add(ville)
+                file.append(ville)
+    return mouvements
+
+def reoptimiser(matrice_distances, tour, ajoutees=(), retirees=(), lignes=None, k_voisins=10,
+                max_mouvements=None, cache=None):
+    """
+    Parcours résolu + modifications -> nouveau parcours (réparation + recherche locale)
+    tour : parcours déjà résolu (numéros de villes de la matrice)
+    ajoutees / retirees : villes à ajouter au parcours / à en retirer
+    lignes : {ville: ligne de distances} mises à jour (voir remplacer_lignes) ; une
+             ville existante dont la ligne change est retirée puis réinsérée
+    cache : CacheTours (optionnel) : si le nouveau parcours porte sur une instance
+            déjà résolue, il est rendu directement ; sinon le résultat y est enregistré
+    Retourne (tour, distance)
+    Exemple :
+        tour, distance = resoudre('tabou', matrice)
+        tour, distance = reoptimiser(matrice, tour, ajoutees=[12], retirees=[3, 7])
+    """
+    ajoutees = list(ajoutees)
+    retirees = list(retirees)
+    if lignes:
+        if cache is not None:
+            cache.empreinte_matrice(matrice_distances)  # état avant modification
+        remplacer_lignes(matrice_distances, lignes)
+        if cache is not None:
+            cache.lignes_remplacees(matrice_distances, lignes)
+        presentes = set(tour)
+        deplacees = [ville for ville in lignes if ville in presentes and ville not in retirees]
+        retirees.extend(deplacees)
+        ajoutees.extend(deplacees)
+    cle = None
+    if cache is not None:
+        villes = (set(tour) - set(retirees)) | set(ajoutees)
+        cle = cache.cle(matrice_distances, villes)
+        resultat = cache.obtenir(cle)
+        if resultat is not None:
+            return resultat
+    tour, touchees = reparer(matrice_distances, tour, ajoutees, retirees)
+    optimiser_localement(matrice_distances, tour, touchees, k_voisins, max_mouvements=max_mouvements)
+    distance = calculer_distance_totale(tour, matrice_distances)
+    if cache is not None:
+        cache.enregistrer(cle, tour, distance)
+    return tour, distance
+
+def resoudre_memorise(cache, algorithme, matrice_distances, graine=None, controle=None, **parametres):
+    """
+    solveurs.resoudre, sauf si l'instance est déjà dans le cache (CacheTours)
+    Exemple : resoudre_memorise(cache, 'tabou', matrice) deux fois -> une seule résolution
+    """
+    cle = cache.cle(matrice_distances)
+    resultat = cache.obtenir(cle)
+    if resultat is not None:
+        return resultat
+    tour, distance = resoudre(algorithme, matrice_distances, graine, controle, **parametres)
+    cache.enregistrer(cle, tour, distance)
+    return list(tour), distance
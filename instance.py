@@ -0,0 +1,102 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : le stockage array('d') suffit
+    np = None
+
+# -----------------------------
+# Instance TSP compacte
+# La matrice des distances est stockée dans UN seul tampon contigu (ligne par ligne)
+# au lieu d'une liste de listes d'objets Python :
+#   liste de listes, 5000 villes : ~25M objets float -> plusieurs centaines de Mo
+#   array('d'), 5000 villes : 25M x 8 octets = 200 Mo ; array('f') : 100 Mo
+# instance[a][b] fonctionne comme avec matrice_distances[a][b] : les algorithmes
+# existants (calculer_distance_totale, recuit_simule, tabu_search...) l'utilisent tel quel.
+# -----------------------------
+
+# Types de valeurs possibles : code array -> type NumPy équivalent
+TYPES_VALEURS = {
+    'd': 'float64',
+    'f': 'float32',
+    'i': 'int32',
+}
+
+class Instance:
+    """
+    n : nombre de villes
+    donnees : tampon plat de n*n distances, donnees[a*n + b] = distance de a à b
+    Exemple : Instance.depuis_matrice(matrice_distances, 'i')
+    """
+    def __init__(self, n, donnees):
+        self.n = n
+        self.donnees = donnees
+        if np is not None and isinstance(donnees, np.ndarray):
+            self._matrice_np = donnees.reshape(n, n)
+            self.lignes = list(self._matrice_np)
+        else:
+            self._matrice_np = None
+            # Une vue par ligne (sans copie) : instance[a][b] = deux accès indexés
+            vue = memoryview(donnees)
+            self.lignes = [vue[a * n:(a + 1) * n] for a in range(n)]
+
+    @classmethod
+    def depuis_matrice(cls, matrice, type_valeurs='d', utiliser_numpy=False):
+        """
+        Convertit une matrice (liste de listes) en instance compacte
+        type_valeurs : 'd' (float64), 'f' (float32) ou 'i' (int32)
+        utiliser_numpy : tampon NumPy au lieu de array (si NumPy est installé)
+        """
+        if type_valeurs not in TYPES_VALEURS:
+            raise ValueError("Type de valeurs inconnu : %r (choix : %s)" % (type_valeurs, ", ".join(TYPES_VALEURS)))
+        n = len(matrice)
+        if utiliser_numpy and np is not None:
+            donnees = np.asarray(matrice, dtype=TYPES_VALEURS[type_valeurs]).reshape(n * n)
+        else:
+            donnees = array(type_valeurs)
+            for ligne in matrice:
+                donnees.extend(ligne)
+        return cls(n, donnees)
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, a):
+        return self.lignes[a]
+
+    def distance(self, a, b):
+        return self.donnees[a * self.n + b]
+
+    def en_numpy(self):
+        # Vue NumPy n x n partageant le même tampon (pas de copie), None sans NumPy
+        if self._matrice_np is None and np is not None:
+            # array : typecode ; memoryview (mmap, mémoire partagée) : format
+            code_type = getattr(self.donnees, 'typecode', None) or self.donnees.format
+            self._matrice_np = np.frombuffer(self.donnees, dtype=TYPES_VALEURS[code_type]).reshape(self.n, self.n)
+        return self._matrice_np
+
+    def distance_totale(self, tour):
+        """
+        Distance du circuit fermé, calculée directement dans le tampon plat
+        Exemple : tour=[0,2,1] -> d(0,2) + d(2,1) + d(1,0)
+        """
+        d = self.donnees
+        n = self.n
+        distance = 0
+        for i in range(len(tour) - 1):
+            distance += d[tour[i] * n + tour[i + 1]]
+        distance += d[tour[-1] * n + tour[0]]
+        return distance
+
+    def memoire(self):
+        # Taille du tampon des distances en octets
+        return self.n * self.n * self.donnees.itemsize
+
+def creer_tour(villes):
+    """
+    Tour compact : array('i') de 4 octets par ville au lieu d'une liste d'entiers Python
+    Supporte les mêmes opérations que les listes utilisées par les algorithmes
+    (indexation, tranches, copie [:], index...)
+    Exemple : creer_tour(range(5)) -> array('i', [0, 1, 2, 3, 4])
+    """
+    return array('i', villes)
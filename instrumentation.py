@@ -0,0 +1,127 @@
+import json
+import time
+
+# -----------------------------------------------
+# Compteurs et chronomètres par phase, optionnels
+# Les solveurs acceptent instrumentation=Instrumentation() ; sans elle, la boucle
+# principale ne contient aucun code de mesure (coût nul).
+# Avec elle, les méthodes mesurées (tirer, delta, appliquer du voisinage,
+# crossover, mutation...) sont remplacées sur l'objet par des versions
+# chronométrées : la boucle elle-même n'est pas modifiée.
+# Phases (durées cumulées en secondes + nombre d'appels) :
+#   recuit : voisin (tirage), evaluation (delta), application (mouvement accepté)
+#   tabou  : recherche (meilleur mouvement, inclut evaluation et filtre_tabou),
+#            evaluation, filtre_tabou (test tabou + aspiration), application
+#            (le voisinage 'echange' évalue ses candidats d'un bloc, sans passer
+#            par delta : chaque recherche compte n(n-1)/2 évaluations)
+#   GA     : selection, croisement, mutation, evaluation
+# Pour la phase evaluation, le nombre d'appels est toujours le nombre de
+# mouvements ou de solutions évalués (GA : un par enfant) : comparable d'un
+# algorithme à l'autre (évaluations par seconde, voir benchmark.py).
+# Compteurs : cache_succes / cache_echecs (CacheDistances) ; evenements :
+# une entrée par amélioration (temps, itération, distance), pour une trace.
+# -----------------------------------------------
+
+class Instrumentation:
+    """
+    Exemple :
+        instrumentation = Instrumentation()
+        recuit_simule(matrice, 100, 1, 0.95, 1000, instrumentation=instrumentation)
+        instrumentation.statistiques()['phases']['evaluation']['appels'] -> 1000
+    """
+    def __init__(self):
+        self.debut = time.perf_counter()
+        self.durees = {}
+        self.appels = {}
+        self.compteurs = {}
+        self.evenements = []
+
+    def chronometrer(self, nom, fonction):
+        """
+        Retourne fonction, chronométrée sous le nom de phase `nom`
+        Exemple : voisins.delta = instrumentation.chronometrer('evaluation', voisins.delta)
+        """
+        durees = self.durees
+        appels = self.appels
+        durees.setdefault(nom, 0.0)
+        appels.setdefault(nom, 0)
+        horloge = time.perf_counter
+
+        def fonction_chronometree(*arguments):
+            debut = horloge()
+            try:
+                return fonction(*arguments)
+            finally:
+                durees[nom] += horloge() - debut
+                appels[nom] += 1
+        return fonction_chronometree
+
+    def ajouter(self, nom, debut, appels=1):
+        # Phase mesurée à la main : debut = time.perf_counter() au début de la phase
+        self.durees[nom] = self.durees.get(nom, 0.0) + time.perf_counter() - debut
+        self.appels[nom] = self.appels.get(nom, 0) + appels
+
+    def compter(self, nom, valeur=1):
+        self.compteurs[nom] = self.compteurs.get(nom, 0) + valeur
+
+    def evenement(self, nom, **donnees):
+        donnees['nom'] = nom
+        donnees['temps'] = time.perf_counter() - self.debut
+        self.evenements.append(donnees)
+
+    def statistiques(self):
+        """
+        Dictionnaire des mesures : durée totale, phases (appels, durée, durée moyenne),
+        compteurs et nombre d'événements
+        """
+        phases = {}
+        for nom, duree in self.durees.items():
+            appels = self.appels[nom]
+            phases[nom] = {
+                'appels': appels,
+                'duree': duree,
+                'duree_moyenne': duree / appels if appels else 0.0,
+            }
+        return {
+            'duree_totale': time.perf_counter() - self.debut,
+            'phases': phases,
+            'compteurs': dict(self.compteurs),
+            'evenements': len(self.evenements),
+        }
+
+    def ecrire_trace(self, chemin):
+        # Fichier JSON : statistiques + liste complète des événements
+        trace = self.statistiques()
+        trace['evenements'] = self.evenements
+        with open(chemin, 'w') as fichier:
+            json.dump(trace, fichier, indent=1)
+
+def instrumenter_voisinage(voisins, instrumentation, phases):
+    """
+    Remplace des méthodes du voisinage par leurs versions chronométrées
+    phases : {nom de méthode: nom de phase}, ex: {'delta': 'evaluation'}
+    """
+    for methode, phase in phases.items():
+        setattr(voisins, methode, instrumentation.chronometrer(phase, getattr(voisins, methode)))
+    return voisins
+
+def instrumenter_evaluation_groupee(voisins, instrumentation, nombre):
+    """
+    Voisinage qui évalue tous ses candidats d'un bloc dans meilleur(), sans delta :
+    chaque appel à meilleur compte `nombre` évaluations dans la phase 'evaluation'
+    """
+    meilleur = voisins.meilleur
+
+    def meilleur_compte(admissible):
+        debut = time.perf_counter()
+        try:
+            return meilleur(admissible)
+        finally:
+            instrumentation.ajouter('evaluation', debut, nombre)
+    voisins.meilleur = meilleur_compte
+    return voisins
+
+def compter_cache(instrumentation, cache, succes_avant, echecs_avant):
+    # Succès / échecs du cache pendant l'exécution (le cache peut être partagé entre appels)
+    instrumentation.compter('cache_succes', cache.succes - succes_avant)
+    instrumentation.compter('cache_echecs', cache.echecs - echecs_avant)
@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from chargement import charger_instance, matrice_depuis_coordonnees
+from controle import Controle
+from solveurs import SOLVEURS, resoudre
+
+# -----------------------------------------------
+# Résolution d'instances en série (ligne de commande)
+#   python lot.py instances.jsonl --algorithme recuit --processus 4 --duree-max 0.2
+#   python lot.py dossier_tsplib/ --algorithme tabou --sortie resultats.jsonl
+# Entrée :
+#   - fichier JSONL, une instance par ligne :
+#       {"id": "r1", "matrice": [[0, 2, ...], ...]}
+#       {"id": "r2", "coordonnees": [[x, y], ...], "type_distance": "EUC_2D"}
+#   - ou dossier de fichiers TSPLIB (.tsp)
+# Les instances sont lues au fur et à mesure et résolues dans un pool de
+# processus (une instance par tâche) ; chaque résultat est écrit (une ligne
+# JSON) dès qu'il est prêt, dans l'ordre de fin et non dans l'ordre d'entrée.
+# -----------------------------------------------
+
+def lire_instances(source):
+    """
+    Générateur de (identifiant, description) ; description est transmise telle
+    quelle au processus de travail, qui construit la matrice lui-même
+    """
+    if os.path.isdir(source):
+        for nom in sorted(os.listdir(source)):
+            if nom.endswith('.tsp'):
+                yield nom[:-4], {'chemin': os.path.join(source, nom)}
+        return
+    with open(source) as fichier:
+        for numero, ligne in enumerate(fichier):
+            ligne = ligne.strip()
+            if ligne:
+                description = json.loads(ligne)
+                yield description.pop('id', numero), description
+
+def construire_matrice(description):
+    if 'chemin' in description:
+        return charger_instance(description['chemin'])
+    if 'matrice' in description:
+        return description['matrice']
+    if 'coordonnees' in description:
+        return matrice_depuis_coordonnees(description['coordonnees'], description.get('type_distance', 'EUC_2D'))
+    raise ValueError("Instance sans 'matrice', 'coordonnees' ni 'chemin'")
+
+def resoudre_tache(identifiant, description, algorithme, parametres, graine, duree_max, patience):
+    # Une instance, dans un processus du pool ; les erreurs sont renvoyées dans le résultat
+    debut = time.perf_counter()
+    try:
+        matrice = construire_matrice(description)
+        controle = Controle(duree_max, patience)
+        solution, distance = resoudre(algorithme, matrice, graine, controle, **parametres)
+    except Exception as erreur:
+        return {'id': identifiant, 'erreur': "%s: %s" % (type(erreur).__name__, erreur)}
+    return {
+        'id': identifiant,
+        'algorithme': algorithme,
+        'distance': distance,
+        'solution': list(solution),
+        'duree': time.perf_counter() - debut,
+        'arret': controle.raison,
+    }
+
+def resoudre_lot(source, sortie, algorithme='recuit', parametres=None, graine=None,
+                 duree_max=None, patience=None, processus=None):
+    """
+    Résout toutes les instances de source et écrit les résultats dans sortie (fichier texte ouvert)
+    graine : l'instance k utilise graine + k (reproductible), None = non fixée
+    Retourne le nombre d'instances traitées
+    """
+    parametres = parametres or {}
+    processus = processus or os.cpu_count() or 1
+    # Au plus 2 tâches en attente par processus : la source n'est pas lue d'un coup
+    en_vol_max = 2 * processus
+    traitees = 0
+    with ProcessPoolExecutor(max_workers=processus) as pool:
+        en_cours = set()
+        for k, (identifiant, description) in enumerate(lire_instances(source)):
+            graine_instance = None if graine is None else graine + k
+            en_cours.add(pool.submit(resoudre_tache, identifiant, description, algorithme, parametres,
+                                     graine_instance, duree_max, patience))
+            if len(en_cours) >= en_vol_max:
+                terminees, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+                traitees += ecrire_resultats(terminees, sortie)
+        while en_cours:
+            terminees, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+            traitees += ecrire_resultats(terminees, sortie)
+    return traitees
+
+def ecrire_resultats(futures, sortie):
+    for f in futures:
+        sortie.write(json.dumps(f.result()) + "\n")
+    sortie.flush()
+    return len(futures)
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Résolution d'instances TSP en série")
+    parseur.add_argument('source', help="fichier JSONL ou dossier de fichiers TSPLIB (.tsp)")
+    parseur.add_argument('--algorithme', default='recuit', choices=sorted(SOLVEURS))
+    parseur.add_argument('--parametres', default='{}',
+                         help="paramètres de l'algorithme en JSON, ex: '{\"voisinage\": \"oropt\"}'")
+    parseur.add_argument('--graine', type=int, default=None)
+    parseur.add_argument('--duree-max', type=float, default=None, help="budget par instance, en secondes")
+    parseur.add_argument('--patience', type=int, default=None, help="arrêt après N itérations sans amélioration")
+    parseur.add_argument('--processus', type=int, default=None, help="nombre de processus (défaut : nombre de cœurs)")
+    parseur.add_argument('--sortie', default=None, help="fichier JSONL des résultats (défaut : sortie standard)")
+    options = parseur.parse_args(arguments)
+
+    sortie = open(options.sortie, 'w') if options.sortie else sys.stdout
+    try:
+        resoudre_lot(options.source, sortie, options.algorithme, json.loads(options.parametres),
+                     options.graine, options.duree_max, options.patience, options.processus)
+    finally:
+        if options.sortie:
+            sortie.close()
+
+if __name__ == "__main__":
+    main()
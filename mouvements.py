@@ -0,0 +1,138 @@
+# -----------------------------------------------
+# Évaluation incrémentale des mouvements d'échange (swap)
+# Au lieu de recalculer toute la distance du parcours (O(n)) pour chaque voisin,
+# on ne regarde que les arêtes touchées par l'échange des positions i et j :
+# au plus 4 arêtes avant l'échange et 4 arêtes après -> O(1)
+# -----------------------------------------------
+import heapq
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : sans lui on garde le parcours en listes
+    np = None
+
+def aretes_touchees(n, i, j):
+    """
+    Indices des arêtes modifiées par l'échange des positions i et j.
+    L'arête k relie solution[k] à solution[(k + 1) % n].
+    Exemple : n=5, i=1, j=3 -> arêtes {0, 1, 2, 3}
+    Un ensemble est utilisé pour ne pas compter deux fois une arête
+    quand i et j sont voisins (ex: i=0, j=n-1 dans le circuit fermé).
+    """
+    return {(i - 1) % n, i, (j - 1) % n, j}
+
+def cout_aretes(solution, matrice_distances, aretes):
+    n = len(solution)
+    cout = 0
+    for k in aretes:
+        cout += matrice_distances[solution[k]][solution[(k + 1) % n]]
+    return cout
+
+def delta_echange(solution, matrice_distances, i, j):
+    """
+    Variation de la distance totale si on échange les villes des positions i et j.
+    delta < 0 -> le voisin est meilleur
+    La solution est modifiée temporairement puis remise dans son état d'origine.
+    """
+    aretes = aretes_touchees(len(solution), i, j)
+    avant = cout_aretes(solution, matrice_distances, aretes)
+    solution[i], solution[j] = solution[j], solution[i]
+    apres = cout_aretes(solution, matrice_distances, aretes)
+    solution[i], solution[j] = solution[j], solution[i]
+    return apres - avant
+
+def appliquer_echange(solution, i, j):
+    # On applique le mouvement directement sur la solution (pas de copie)
+    solution[i], solution[j] = solution[j], solution[i]
+
+# -----------------------------------------------
+# Recherche du meilleur échange dans tout le voisinage
+# admissible(i, j, delta) : fonction qui dit si le mouvement (i, j) est autorisé
+# (ex: non tabou, ou tabou mais qui améliore la meilleure solution). Les mouvements sont testés du meilleur au pire.
+# -----------------------------------------------
+def matrice_numpy(matrice_distances):
+    # Conversion unique de la matrice des distances (None si NumPy est absent)
+    if np is None:
+        return None
+    # Instance compacte (instance.py) : vue NumPy sur son tampon, sans copie
+    if hasattr(matrice_distances, 'en_numpy'):
+        return matrice_distances.en_numpy()
+    # On garde le type des distances (entières ou réelles)
+    return np.asarray(matrice_distances)
+
+def matrice_deltas_echange(solution, matrice_np):
+    """
+    Calcule en une seule opération NumPy le delta de tous les échanges (i, j).
+    Pour des positions non voisines, la ville t[j] prend la place de t[i]
+    entre les villes précédente p[i] et suivante s[i] (et inversement).
+    Les paires voisines dans le circuit (au plus n) sont recalculées avec delta_echange.
+    Seul le triangle supérieur (i < j) est valide, le reste vaut la valeur maximale.
+    """
+    n = len(solution)
+    t = np.asarray(solution)
+    p = np.roll(t, 1)   # ville précédente de chaque position
+    s = np.roll(t, -1)  # ville suivante de chaque position
+    D = matrice_np
+    avant = D[p, t] + D[t, s]
+    deltas = (
+        D[p[:, None], t[None, :]] + D[t[None, :], s[:, None]]
+        + D[p[None, :], t[:, None]] + D[t[:, None], s[None, :]]
+        - avant[:, None] - avant[None, :]
+    )
+    for i in range(n):
+        j = (i + 1) % n
+        a, b = min(i, j), max(i, j)
+        if a != b:
+            deltas[a, b] = delta_echange(solution, matrice_np, a, b)
+    if np.issubdtype(deltas.dtype, np.integer):
+        deltas[np.tril_indices(n)] = np.iinfo(deltas.dtype).max
+    else:
+        deltas[np.tril_indices(n)] = np.inf
+    return deltas
+
+def meilleur_echange(solution, matrice_distances, admissible, matrice_np=None):
+    """
+    Retourne (delta, i, j) pour le meilleur échange admissible, ou None.
+    Avec NumPy (matrice_np fournie) : tous les deltas sont calculés d'un bloc.
+    Sans NumPy : les deltas sont calculés un par un en O(1) puis rangés dans un tas.
+    """
+    n = len(solution)
+    if matrice_np is not None:
+        deltas = matrice_deltas_echange(solution, matrice_np)
+        # Cas le plus fréquent : le meilleur mouvement est admissible
+        i, j = divmod(int(np.argmin(deltas)), n)
+        if i < j and admissible(i, j, deltas[i, j].item()):
+            return deltas[i, j].item(), i, j
+        # Sinon (mouvement tabou) : on examine les plus petits deltas par préfixes
+        # croissants (np.partition, O(n²) par préfixe) au lieu de trier toute la
+        # matrice (O(n² log n)). Chaque préfixe contient toutes les cases <= seuil,
+        # triées par (delta, indice) : même ordre qu'un tri stable complet.
+        plat = deltas.ravel()
+        examines = 1  # la case de l'argmin, déjà testée
+        taille = 16
+        while examines < plat.size:
+            taille = min(taille, plat.size)
+            seuil = np.partition(plat, taille - 1)[taille - 1]
+            candidats = np.flatnonzero(plat <= seuil)
+            candidats = candidats[np.argsort(plat[candidats], kind='stable')]
+            for k in candidats[examines:]:
+                i, j = divmod(int(k), n)
+                if i >= j:  # on a atteint les cases du triangle inférieur
+                    return None
+                if admissible(i, j, deltas[i, j].item()):
+                    return deltas[i, j].item(), i, j
+            examines = len(candidats)
+            taille *= 4
+        return None
+
+    mouvements = [
+        (delta_echange(solution, matrice_distances, i, j), i, j)
+        for i in range(n)
+        for j in range(i + 1, n)
+    ]
+    heapq.heapify(mouvements)
+    while mouvements:
+        delta, i, j = heapq.heappop(mouvements)
+        if admissible(i, j, delta):
+            return delta, i, j
+    return None
@@ -0,0 +1,261 @@
+import math
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from instance import Instance, TYPES_VALEURS
+from chargement import charger_matrice_mappee
+from recuit_simule import recuit_simule, palier_metropolis
+from voisinage import creer_voisinage
+from cache_fitness import CacheDistances
+from controle import Controle
+
+# -----------------------------------------------
+# Recuit simulé parallèle : N chaînes indépendantes (graines différentes)
+# réparties sur un pool de processus.
+# La matrice des distances est copiée UNE fois en mémoire partagée : chaque
+# processus s'y attache au démarrage au lieu de recevoir une copie picklée
+# à chaque tâche.
+# Une matrice déjà ouverte en mmap (fichier .bin) n'est pas copiée : chaque
+# processus rouvre le fichier, et le système partage les mêmes pages en mémoire.
+# -----------------------------------------------
+
+def _code_type(matrice_distances):
+    # Code array du tampon : array (typecode), NumPy (dtype) ou memoryview (format) ;
+    # matrice en listes : 'i' si toutes les valeurs sont des entiers 32 bits
+    # (une copie en 'd' doublerait la mémoire partagée), sinon 'd'
+    donnees = getattr(matrice_distances, 'donnees', None)
+    if donnees is None:
+        for ligne in matrice_distances:
+            for valeur in ligne:
+                if not isinstance(valeur, int) or not -2 ** 31 <= valeur < 2 ** 31:
+                    return 'd'
+        return 'i'
+    if hasattr(donnees, 'typecode'):
+        return donnees.typecode
+    if hasattr(donnees, 'dtype'):
+        for code_type, nom in TYPES_VALEURS.items():
+            if donnees.dtype == nom:
+                return code_type
+        return 'd'
+    return getattr(donnees, 'format', 'd')
+
+def partager_matrice(matrice_distances):
+    """
+    Copie la matrice (n x n) dans un segment de mémoire partagée
+    Retourne (segment, description) ; description = (nom, n, code_type)
+    permet aux processus de s'y rattacher (voir _attacher_matrice)
+    Le segment doit être libéré par l'appelant : segment.close() puis segment.unlink()
+    """
+    n = len(matrice_distances)
+    code_type = _code_type(matrice_distances)
+    taille_valeur = 4 if code_type in ('f', 'i') else 8
+    segment = shared_memory.SharedMemory(create=True, size=max(1, n * n * taille_valeur))
+    vue = segment.buf.cast(code_type)
+    for a in range(n):
+        vue[a * n:(a + 1) * n] = memoryview(array(code_type, matrice_distances[a]))
+    vue.release()
+    return segment, (segment.name, n, code_type)
+
+# Matrice du processus courant (attachée une fois par processus du pool)
+_matrice_processus = None
+_segment_processus = None
+# Voisinages déjà construits dans ce processus (listes de voisins calculées une fois)
+_voisinages_processus = {}
+
+def _attacher_matrice(description, matrice=None, fichier=None):
+    """
+    Initialisation d'un processus du pool
+    description : (nom, n, code_type) d'un segment créé par partager_matrice,
+                  ou None si la matrice est transmise directement (ex: matrice
+                  paresseuse, qui ne contient que les coordonnées)
+    fichier : (chemin, type_valeurs) d'une matrice mmap à rouvrir dans ce processus
+    """
+    global _matrice_processus, _segment_processus
+    if fichier is not None:
+        _matrice_processus = charger_matrice_mappee(*fichier)
+        return
+    if description is None:
+        _matrice_processus = matrice
+        return
+    nom, n, code_type = description
+    # Le segment reste la propriété du processus principal (qui fait unlink)
+    _segment_processus = shared_memory.SharedMemory(name=nom)
+    _matrice_processus = Instance(n, _segment_processus.buf.cast(code_type))
+
+def _executer_chaine(graine, parametres, duree_max=None, patience=None):
+    # Une chaîne de recuit dans un processus du pool
+    # (un Controle par chaîne : le budget de temps s'applique à chacune)
+    random.seed(graine)
+    debut = time.perf_counter()
+    controle = Controle(duree_max, patience) if duree_max is not None or patience is not None else None
+    solution, distance = recuit_simule(_matrice_processus, controle=controle, **parametres)
+    return {
+        'graine': graine,
+        'solution': solution,
+        'distance': distance,
+        'duree': time.perf_counter() - debut,
+        'processus': os.getpid(),
+    }
+
+def preparer_pool(matrice_distances, processus=None):
+    """
+    Crée le pool de processus et partage la matrice
+    Retourne (pool, segment) ; segment vaut None si la matrice n'est pas copiée
+    (matrice paresseuse : elle est transmise telle quelle, seules les coordonnées sont picklées ;
+    matrice mmap : chaque processus rouvre le fichier)
+    """
+    if getattr(matrice_distances, 'fichier', None) is not None:
+        segment = None
+        initargs = (None, None, matrice_distances.fichier)
+    elif hasattr(matrice_distances, 'coordonnees'):
+        segment = None
+        initargs = (None, matrice_distances)
+    else:
+        segment, description = partager_matrice(matrice_distances)
+        initargs = (description,)
+    pool = ProcessPoolExecutor(max_workers=processus, initializer=_attacher_matrice, initargs=initargs)
+    return pool, segment
+
+def liberer_pool(pool, segment):
+    pool.shutdown()
+    if segment is not None:
+        segment.close()
+        segment.unlink()
+
+def recuit_simule_parallele(matrice_distances, nombre_chaines, T0, Tmin, alpha, max_iterations,
+                            voisinage='echange', k_voisins=10, processus=None, graine=None,
+                            duree_max=None, patience=None):
+    """
+    Lance nombre_chaines recuits indépendants en parallèle
+    processus : nombre de processus (par défaut : nombre de cœurs)
+    graine : graine de départ, la chaîne k utilise graine + k (reproductible)
+    duree_max / patience : budget de temps et arrêt sur stagnation de chaque chaîne
+                           (voir controle.py)
+    Retourne (meilleure_solution, meilleure_distance, statistiques)
+    statistiques : une entrée par chaîne (graine, distance, duree, processus)
+    """
+    if graine is None:
+        graine = random.randrange(2 ** 31)
+    parametres = {
+        'T0': T0, 'Tmin': Tmin, 'alpha': alpha, 'max_iterations': max_iterations,
+        'voisinage': voisinage, 'k_voisins': k_voisins,
+    }
+    pool, segment = preparer_pool(matrice_distances, processus)
+    try:
+        futures = [
+            pool.submit(_executer_chaine, graine + k, parametres, duree_max, patience)
+            for k in range(nombre_chaines)
+        ]
+        resultats = [f.result() for f in futures]
+    finally:
+        liberer_pool(pool, segment)
+    meilleur = min(resultats, key=lambda r: r['distance'])
+    statistiques = [{cle: r[cle] for cle in ('graine', 'distance', 'duree', 'processus')} for r in resultats]
+    return meilleur['solution'], meilleur['distance'], statistiques
+
+# -----------------------------------------------
+# Parallel tempering (échange de répliques)
+# Une réplique par température fixe (échelle de T décroissantes). Chaque tour :
+#  1. chaque réplique fait pas_par_echange mouvements de Metropolis à sa
+#     température, en parallèle dans le pool
+#  2. on propose d'échanger les états de deux températures voisines i et i+1,
+#     accepté avec la probabilité min(1, exp((1/T_i - 1/T_i+1) * (E_i - E_i+1)))
+# Les bonnes solutions descendent vers les basses températures, les chaînes
+# chaudes continuent d'explorer : tout le budget d'itérations est utilisé.
+# -----------------------------------------------
+
+def echelle_temperatures(Tmax, Tmin, nombre_repliques):
+    """
+    Températures en progression géométrique de Tmax à Tmin
+    Exemple : echelle_temperatures(100, 1, 3) -> [100.0, 10.0, 1.0]
+    """
+    if nombre_repliques == 1:
+        return [float(Tmin)]
+    rapport = (Tmin / Tmax) ** (1 / (nombre_repliques - 1))
+    return [Tmax * rapport ** k for k in range(nombre_repliques)]
+
+def _executer_palier(solution, distance, T, nombre_pas, graine, voisinage, k_voisins):
+    # Un palier de Metropolis pour une réplique, dans un processus du pool
+    random.seed(graine)
+    cle = (voisinage, k_voisins)
+    if cle not in _voisinages_processus:
+        _voisinages_processus[cle] = creer_voisinage(voisinage, _matrice_processus, k_voisins)
+    voisins = _voisinages_processus[cle]
+    voisins.preparer(solution)
+    distance, meilleure_solution, meilleure_distance, acceptes = palier_metropolis(voisins, distance, T, nombre_pas)
+    return solution, distance, meilleure_solution, meilleure_distance, acceptes
+
+def recuit_parallel_tempering(matrice_distances, temperatures, nombre_echanges, pas_par_echange,
+                              voisinage='echange', k_voisins=10, processus=None, graine=None, controle=None):
+    """
+    temperatures : températures des répliques (ex: echelle_temperatures(100, 1, 8))
+    nombre_echanges : nombre de tours (palier parallèle + tentatives d'échange)
+    pas_par_echange : mouvements de Metropolis par réplique entre deux échanges
+    Retourne (meilleure_solution, meilleure_distance, statistiques)
+    statistiques : taux d'acceptation des mouvements par température et
+                   taux d'acceptation des échanges entre températures voisines
+    controle : Controle (voir controle.py), vérifié à chaque tour
+    """
+    if controle is not None:
+        controle.demarrer()
+    rng = random.Random(graine)
+    nombre_repliques = len(temperatures)
+    n = len(matrice_distances)
+    cache = CacheDistances(matrice_distances)
+
+    # États initiaux aléatoires : etats[k] = (solution, distance) à la température k
+    etats = []
+    for _ in range(nombre_repliques):
+        solution = list(range(n))
+        rng.shuffle(solution)
+        etats.append((solution, cache.distance(solution)))
+    meilleure_solution, meilleure_distance = min(etats, key=lambda e: e[1])
+    meilleure_solution = meilleure_solution[:]
+
+    mouvements_acceptes = [0] * nombre_repliques
+    echanges_proposes = [0] * (nombre_repliques - 1)
+    echanges_acceptes = [0] * (nombre_repliques - 1)
+    tours_faits = 0
+
+    pool, segment = preparer_pool(matrice_distances, processus)
+    try:
+        for tour in range(nombre_echanges):
+            if controle is not None and not controle.continuer():
+                break
+            # 1. Paliers en parallèle (une tâche par réplique)
+            futures = [
+                pool.submit(_executer_palier, solution, distance, temperatures[k], pas_par_echange,
+                            rng.randrange(2 ** 31), voisinage, k_voisins)
+                for k, (solution, distance) in enumerate(etats)
+            ]
+            for k, f in enumerate(futures):
+                solution, distance, meilleure_locale, distance_locale, acceptes = f.result()
+                etats[k] = (solution, distance)
+                mouvements_acceptes[k] += acceptes
+                if distance_locale < meilleure_distance:
+                    meilleure_solution, meilleure_distance = meilleure_locale, distance_locale
+                    if controle is not None:
+                        controle.signaler(meilleure_solution, meilleure_distance)
+
+            # 2. Échanges entre températures voisines (paires paires / impaires en alternance)
+            for i in range(tour % 2, nombre_repliques - 1, 2):
+                echanges_proposes[i] += 1
+                exposant = (1 / temperatures[i] - 1 / temperatures[i + 1]) * (etats[i][1] - etats[i + 1][1])
+                if exposant >= 0 or rng.random() < math.exp(exposant):
+                    etats[i], etats[i + 1] = etats[i + 1], etats[i]
+                    echanges_acceptes[i] += 1
+            tours_faits += 1
+    finally:
+        liberer_pool(pool, segment)
+
+    statistiques = {
+        'temperatures': list(temperatures),
+        'taux_acceptation': [a / (max(1, tours_faits) * pas_par_echange) for a in mouvements_acceptes],
+        'taux_echange': [a / p if p else 0.0 for a, p in zip(echanges_acceptes, echanges_proposes)],
+    }
+    # Distance exacte de la meilleure solution (sans cumul d'erreurs d'arrondi des deltas)
+    return meilleure_solution, cache.distance(meilleure_solution), statistiques
@@ -1,19 +1,11 @@
 import random
 import math
 
-# -----------------------------------------------
-# Fonction pour calculer la distance totale d'une solution (parcours)
-# solution : liste d'indices de villes, ex: [0, 3, 1, 2]
-# matrice_distances : matrice des distances entre les villes
-# -----------------------------------------------
-def calculer_distance_totale(solution, matrice_distances):
-    distance_totale = 0
-    # On parcourt toutes les villes et on additionne les distances
-    for i in range(len(solution) - 1):
-        distance_totale += matrice_distances[solution[i]][solution[i + 1]]
-    # Ajouter la distance pour revenir au départ (circuit fermé)
-    distance_totale += matrice_distances[solution[-1]][solution[0]]
-    return distance_totale
+from voisinage import creer_voisinage
+from cache_fitness import CacheDistances, calculer_distance_totale
+from refroidissement import Geometrique, estimer_T0
+from instrumentation import instrumenter_voisinage, compter_cache
+from construction import construire_tour
 
 # -----------------------------------------------
 # Fonction pour générer un voisin
@@ -29,76 +21,162 @@ def generer_voisin(solution):
 # -----------------------------------------------
 # Recuit simulé pour le TSP
 # matrice_distances : matrice des distances
-# T0 : température initiale (ex : 100)
+# T0 : température initiale (ex : 100), None -> estimée depuis des deltas échantillonnés
 # Tmin : température finale (ex : 1)
-# alpha : facteur de refroidissement (ex : 0.95)
+# alpha : facteur de refroidissement (ex : 0.95), utilisé si schema est None
 # max_iterations : nombre max d'itérations
+# voisinage : 'echange', '2opt' ou 'oropt' (voir voisinage.py)
+# k_voisins : taille des listes de plus proches voisins pour 2opt / oropt
+# cache : CacheDistances partagé entre plusieurs appels (optionnel)
+# schema : schéma de refroidissement (voir refroidissement.py),
+#          ex: LundyMees(), Adaptatif(), Rechauffage(Geometrique())
+# pas_par_palier : nombre de mouvements à chaque température (1 = schéma d'origine)
+# controle : Controle (voir controle.py) pour un budget de temps, un arrêt sur
+#            stagnation ou un rappel à chaque amélioration (optionnel)
+# instrumentation : Instrumentation (voir instrumentation.py) pour mesurer le
+#                   temps par phase et les compteurs (optionnel, sans coût sinon)
+# init : tour de départ, 'aleatoire' (par défaut), 'plus_proche_voisin', 'glouton',
+#        'hilbert', 'insertion' (voir construction.py) ou un parcours déjà construit
+# coordonnees : coordonnées des villes, pour init='hilbert' sur une matrice dense
 # -----------------------------------------------
-def recuit_simule(matrice_distances, T0, Tmin, alpha, max_iterations):
-    nombre_villes = len(matrice_distances)
-    
+def recuit_simule(matrice_distances, T0, Tmin, alpha, max_iterations, voisinage='echange', k_voisins=10, cache=None,
+                  schema=None, pas_par_palier=1, controle=None, instrumentation=None, init='aleatoire',
+                  coordonnees=None):
+    if controle is not None:
+        controle.demarrer()
     # --------------------------
     # 1. Solution initiale
-    # On crée une solution aléatoire, ex: [0, 2, 1, 3, 4,...]
+    # Par défaut on crée une solution aléatoire, ex: [0, 2, 1, 3, 4,...]
     # --------------------------
-    solution_actuelle = list(range(nombre_villes))
-    random.shuffle(solution_actuelle)
-    distance_actuelle = calculer_distance_totale(solution_actuelle, matrice_distances)
+    solution_actuelle = construire_tour(init, matrice_distances, k_voisins, coordonnees)
+    if cache is None:
+        cache = CacheDistances(matrice_distances)
+    succes_cache, echecs_cache = cache.succes, cache.echecs
+    distance_actuelle = cache.distance(solution_actuelle)
+    
+    # Le voisinage travaille directement sur solution_actuelle (mouvements sur place)
+    voisins = creer_voisinage(voisinage, matrice_distances, k_voisins)
+    voisins.preparer(solution_actuelle)
     
     # On initialise la meilleure solution trouvée
     meilleure_solution = solution_actuelle[:]
     meilleure_distance = distance_actuelle
+    if controle is not None:
+        controle.signaler(meilleure_solution, meilleure_distance)
+    
+    if T0 is None:
+        T0 = estimer_T0(voisins)
+    if schema is None:
+        schema = Geometrique(alpha)
+    schema.initialiser(T0, Tmin, max_iterations // max(1, pas_par_palier))
+    if instrumentation is not None:
+        instrumenter_voisinage(voisins, instrumentation,
+                               {'tirer': 'voisin', 'delta': 'evaluation', 'appliquer': 'application'})
     
     T = T0
     iteration = 0
+    arret = False
     
     # --------------------------
     # 2. Boucle principale
     # Tant que la température > Tmin et qu'on n'a pas dépassé le max d'itérations
+    # Chaque palier fait pas_par_palier mouvements à la même température
     # --------------------------
     while T > Tmin and iteration < max_iterations:
-        # Générer un voisin aléatoire
-        voisin = generer_voisin(solution_actuelle)
-        distance_voisin = calculer_distance_totale(voisin, matrice_distances)
-        
-        # Calculer ΔE (différence de distance)
-        delta_E = distance_voisin - distance_actuelle
+        acceptes = 0
+        tentes = 0
+        amelioration = False
+        while tentes < pas_par_palier and iteration < max_iterations:
+            if controle is not None and not controle.continuer():
+                arret = True  # budget de temps épuisé ou stagnation
+                break
+            
+            # Tirer un mouvement aléatoire (ex: échanger les villes des positions i et j)
+            # On n'évalue que les arêtes touchées par le mouvement -> O(1) au lieu de O(n)
+            mouvement = voisins.tirer()
+            if mouvement is None:  # trop peu de villes, aucun mouvement possible
+                break
+            
+            # Calculer ΔE (différence de distance)
+            delta_E = voisins.delta(mouvement)
+            
+            # --------------------------
+            # 3. Décision d'accepter le voisin
+            # --------------------------
+            if delta_E < 0:   #Accepter ΔE < 0 → toujours (solution meilleure)
+                # Si le voisin est meilleur (distance plus petite), on accepte toujours
+                voisins.appliquer(mouvement)
+                distance_actuelle += delta_E
+                acceptes += 1
+                # Exemple : distance_actuelle = 95 -> voisin = 80 -> accepte
+            else:
+                # Si le voisin est pire, on peut l'accepter avec probabilité P
+                P = math.exp(-delta_E / T)
+                # Exemple : ΔE = 5, T = 100 -> P = exp(-5/100) ≈ 0.951
+                if random.random() < P:  #random.random() tire un nombre entre 0 et 1
+                    #Accepter ΔE > 0 → avec probabilité P qui diminue avec T
+                    voisins.appliquer(mouvement)
+                    distance_actuelle += delta_E
+                    acceptes += 1
+                    # Parfois, on accepte une solution pire pour sortir d'un minimum local
+            
+            # --------------------------
+            # 4. Mise à jour de la meilleure solution
+            # --------------------------
+            if distance_actuelle < meilleure_distance:
+                # On a trouvé une nouvelle meilleure solution
+                meilleure_solution = solution_actuelle[:]
+                meilleure_distance = distance_actuelle
+                amelioration = True
+                if controle is not None:
+                    controle.signaler(meilleure_solution, meilleure_distance)
+                if instrumentation is not None:
+                    instrumentation.evenement('amelioration', iteration=iteration, distance=meilleure_distance)
+                # Exemple : meilleure_distance passe de 95 -> 80
+            
+            tentes += 1
+            iteration += 1  # incrémenter le compteur
         
-        # --------------------------
-        # 3. Décision d'accepter le voisin
-        # --------------------------
-        if delta_E < 0:   #Accepter ΔE < 0 → toujours (solution meilleure)
-            # Si le voisin est meilleur (distance plus petite), on accepte toujours
-            solution_actuelle = voisin
-            distance_actuelle = distance_voisin
-            # Exemple : distance_actuelle = 95 -> voisin = 80 -> accepte
-        else:
-            # Si le voisin est pire, on peut l'accepter avec probabilité P
-            P = math.exp(-delta_E / T)
-            # Exemple : ΔE = 5, T = 100 -> P = exp(-5/100) ≈ 0.951
-            if random.random() < P:  #random.random() tire un nombre entre 0 et 1
-                #Accepter ΔE > 0 → avec probabilité P qui diminue avec T
-                solution_actuelle = voisin
-                distance_actuelle = distance_voisin
-                # Parfois, on accepte une solution pire pour sortir d'un minimum local
+        if tentes == 0 or arret:
+            break
         
         # --------------------------
-        # 4. Mise à jour de la meilleure solution
+        # 5. Refroidissement (température suivante donnée par le schéma)
         # --------------------------
-        if distance_actuelle < meilleure_distance:
-            # On a trouvé une nouvelle meilleure solution
-            meilleure_solution = solution_actuelle[:]
-            meilleure_distance = distance_actuelle
-            # Exemple : meilleure_distance passe de 95 -> 80
-        
-        # --------------------------
-        # 5. Refroidissement
-        # --------------------------
-        T = T * alpha  # diminuer la température
-        iteration += 1  # incrémenter le compteur
+        T = schema.suivante(T, acceptes / tentes, amelioration)
 
+    # Distance exacte de la meilleure solution (sans cumul d'erreurs d'arrondi des deltas)
+    meilleure_distance = cache.distance(meilleure_solution)
+    if instrumentation is not None:
+        compter_cache(instrumentation, cache, succes_cache, echecs_cache)
     return meilleure_solution, meilleure_distance
 
+# -----------------------------------------------
+# Palier de Metropolis à température fixe
+# Utilisé par le parallel tempering (parallele.py) : chaque réplique fait
+# nombre_pas mouvements à SA température, sans refroidissement.
+# voisins : voisinage déjà préparé sur la solution (modifiée sur place)
+# Retourne (distance_actuelle, meilleure_solution, meilleure_distance, acceptes)
+# -----------------------------------------------
+def palier_metropolis(voisins, distance_actuelle, T, nombre_pas):
+    meilleure_solution = voisins.solution[:]
+    meilleure_distance = distance_actuelle
+    acceptes = 0
+    for _ in range(nombre_pas):
+        mouvement = voisins.tirer()
+        if mouvement is None:
+            break
+        delta_E = voisins.delta(mouvement)
+        # Même règle que le recuit : toujours si ΔE < 0, sinon avec probabilité exp(-ΔE / T)
+        if delta_E < 0 or random.random() < math.exp(-delta_E / T):
+            voisins.appliquer(mouvement)
+            distance_actuelle += delta_E
+            acceptes += 1
+            if distance_actuelle < meilleure_distance:
+                meilleure_solution = voisins.solution[:]
+                meilleure_distance = distance_actuelle
+    return distance_actuelle, meilleure_solution, meilleure_distance, acceptes
+
 # -----------------------------------------------
 # Exemple de matrice des distances entre 10 villes
 # matrice_distances[i][j] = distance de la ville i à j
@@ -124,12 +202,15 @@ max_iterations = 1000
 
 # -----------------------------------------------
 # Exécution du recuit simulé
+# (seulement si le fichier est lancé directement : l'importer ne lance rien,
+# ce qui permet de l'utiliser depuis des processus parallèles)
 # -----------------------------------------------
-meilleure_solution, meilleure_distance = recuit_simule(
-    matrice_distances, T0, Tmin, alpha, max_iterations
-)
+if __name__ == "__main__":
+    meilleure_solution, meilleure_distance = recuit_simule(
+        matrice_distances, T0, Tmin, alpha, max_iterations
+    )
 
-# Affichage des résultats
-print("Recuit Simulé")
-print("Meilleure Solution trouvée :", meilleure_solution)
-print("Distance Minimale :", meilleure_distance)
+    # Affichage des résultats
+    print("Recuit Simulé")
+    print("Meilleure Solution trouvée :", meilleure_solution)
+    print("Distance Minimale :", meilleure_distance)
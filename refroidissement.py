@@ -0,0 +1,140 @@
+import math
+
+# -----------------------------------------------
+# Schémas de refroidissement pour le recuit simulé
+# Le recuit fait pas_par_palier mouvements à température constante (un palier),
+# puis demande la température suivante au schéma :
+#   T = schema.suivante(T, taux_acceptation, amelioration)
+# taux_acceptation : proportion de mouvements acceptés pendant le palier
+# amelioration : True si la meilleure solution a progressé pendant le palier
+# initialiser(T0, Tmin, nombre_paliers) est appelé une fois au début : un schéma
+# sans paramètre explicite se règle pour atteindre Tmin à la fin du budget.
+# -----------------------------------------------
+
+class Geometrique:
+    """
+    T = T * alpha (schéma d'origine)
+    alpha=None : alpha choisi pour passer de T0 à Tmin en nombre_paliers paliers
+    Exemple : T0=100, Tmin=1, 90 paliers -> alpha ≈ 0.95
+    """
+    def __init__(self, alpha=None):
+        self.alpha = alpha
+
+    def initialiser(self, T0, Tmin, nombre_paliers):
+        if self.alpha is None:
+            self.alpha = (Tmin / T0) ** (1 / max(1, nombre_paliers))
+
+    def suivante(self, T, taux_acceptation, amelioration):
+        return T * self.alpha
+
+class LundyMees:
+    """
+    Lundy & Mees : T = T / (1 + beta * T)
+    Décroissance rapide quand T est grand, très lente près de Tmin
+    beta=None : beta choisi pour passer de T0 à Tmin en nombre_paliers paliers
+    """
+    def __init__(self, beta=None):
+        self.beta = beta
+
+    def initialiser(self, T0, Tmin, nombre_paliers):
+        if self.beta is None:
+            self.beta = (T0 - Tmin) / (max(1, nombre_paliers) * T0 * Tmin)
+
+    def suivante(self, T, taux_acceptation, amelioration):
+        return T / (1 + self.beta * T)
+
+class Adaptatif:
+    """
+    Température pilotée par le taux d'acceptation
+    Le taux visé décroît de cible_initiale à cible_finale au fil des paliers ;
+    on chauffe si on accepte moins que visé, on refroidit si on accepte plus :
+    T = T * exp(gain * (cible - taux_acceptation))
+    Exemple : cible=0.3, taux=0.5 -> T * exp(-0.2 * gain) (on refroidit)
+    """
+    def __init__(self, cible_initiale=0.5, cible_finale=0.01, gain=2.0):
+        self.cible_initiale = cible_initiale
+        self.cible_finale = cible_finale
+        self.gain = gain
+        self.cible = cible_initiale
+        self.decroissance = 1.0
+
+    def initialiser(self, T0, Tmin, nombre_paliers):
+        self.cible = self.cible_initiale
+        self.decroissance = (self.cible_finale / self.cible_initiale) ** (1 / max(1, nombre_paliers))
+
+    def suivante(self, T, taux_acceptation, amelioration):
+        T = T * math.exp(self.gain * (self.cible - taux_acceptation))
+        self.cible *= self.decroissance
+        return T
+
+class Rechauffage:
+    """
+    Réchauffage : enveloppe un autre schéma (ex: Rechauffage(Geometrique()))
+    Si la meilleure solution ne progresse plus pendant `patience` paliers alors
+    que le schéma a déjà bien refroidi (T < fraction² * T de la dernière amélioration),
+    la température remonte à fraction * T de la dernière amélioration.
+    Sans nouveau progrès, le réchauffage suivant vise encore fraction fois plus bas :
+    les réchauffages décroissent géométriquement et le recuit finit par refroidir.
+    """
+    def __init__(self, schema, patience=20, fraction=0.5):
+        self.schema = schema
+        self.patience = patience
+        self.fraction = fraction
+        self.T_amelioration = None
+        self.paliers_sans_progres = 0
+        self.rechauffages = 0
+
+    def initialiser(self, T0, Tmin, nombre_paliers):
+        self.T_amelioration = T0
+        self.paliers_sans_progres = 0
+        self.rechauffages = 0
+        self.schema.initialiser(T0, Tmin, nombre_paliers)
+
+    def suivante(self, T, taux_acceptation, amelioration):
+        if amelioration:
+            self.paliers_sans_progres = 0
+            self.T_amelioration = T
+        else:
+            self.paliers_sans_progres += 1
+        cible = self.fraction * self.T_amelioration
+        if self.paliers_sans_progres >= self.patience and T < self.fraction * cible:
+            self.paliers_sans_progres = 0
+            self.rechauffages += 1
+            self.T_amelioration = cible
+            return cible
+        return self.schema.suivante(T, taux_acceptation, amelioration)
+
+SCHEMAS = {
+    'geometrique': Geometrique,
+    'lundy_mees': LundyMees,
+    'adaptatif': Adaptatif,
+}
+
+def creer_schema(nom, rechauffage=False, **parametres):
+    """
+    Exemple : creer_schema('lundy_mees', rechauffage=True)
+    """
+    if nom not in SCHEMAS:
+        raise ValueError("Schéma de refroidissement inconnu : %r (choix : %s)" % (nom, ", ".join(SCHEMAS)))
+    schema = SCHEMAS[nom](**parametres)
+    return Rechauffage(schema) if rechauffage else schema
+
+def estimer_T0(voisins, taux_cible=0.8, echantillons=200):
+    """
+    Température initiale estimée à partir de deltas échantillonnés :
+    on tire des mouvements aléatoires (sans les appliquer) et on choisit T0
+    pour qu'un mouvement dégradant moyen soit accepté avec probabilité taux_cible
+    exp(-moyenne(ΔE > 0) / T0) = taux_cible -> T0 = -moyenne / ln(taux_cible)
+    voisins : voisinage préparé sur la solution initiale
+    """
+    degradations = []
+    for _ in range(echantillons):
+        mouvement = voisins.tirer()
+        if mouvement is None:
+            break
+        delta = voisins.delta(mouvement)
+        if delta > 0:
+            degradations.append(delta)
+    if not degradations:
+        return 1.0
+    return -(sum(degradations) / len(degradations)) / math.log(taux_cible)
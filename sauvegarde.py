@@ -0,0 +1,77 @@
+import os
+import pickle
+import tempfile
+import zlib
+from array import array
+
+# -----------------------------------------------
+# Points de reprise (checkpoints) pour les longues recherches
+# L'état complet de la recherche (solutions, mémoire taboue ou population,
+# meilleure solution, état du générateur random) est écrit régulièrement
+# dans un fichier binaire compact : pickle compressé par zlib, parcours
+# stockés en array('i') (4 octets par ville).
+# L'écriture est atomique : fichier temporaire dans le même dossier, puis
+# os.replace. Un arrêt brutal pendant l'écriture laisse l'ancien point de reprise intact.
+# Relancer le même appel avec le même fichier reprend là où la recherche
+# s'était arrêtée, avec exactement le même résultat qu'une exécution sans interruption.
+# -----------------------------------------------
+
+ENTETE = b'TSPREP1\n'
+
+def ecrire_etat(chemin, etat):
+    donnees = ENTETE + zlib.compress(pickle.dumps(etat, protocol=pickle.HIGHEST_PROTOCOL))
+    dossier = os.path.dirname(os.path.abspath(chemin))
+    descripteur, temporaire = tempfile.mkstemp(dir=dossier, prefix='.reprise-')
+    try:
+        with os.fdopen(descripteur, 'wb') as fichier:
+            fichier.write(donnees)
+            fichier.flush()
+            os.fsync(fichier.fileno())
+        os.replace(temporaire, chemin)
+    except BaseException:
+        os.unlink(temporaire)
+        raise
+
+def lire_etat(chemin):
+    with open(chemin, 'rb') as fichier:
+        donnees = fichier.read()
+    if not donnees.startswith(ENTETE):
+        raise ValueError("Fichier de reprise invalide : %s" % chemin)
+    return pickle.loads(zlib.decompress(donnees[len(ENTETE):]))
+
+def compacter(tour):
+    # Parcours -> array('i') pour le fichier de reprise
+    return array('i', tour)
+
+class PointReprise:
+    """
+    chemin : fichier de reprise (créé au besoin, repris s'il existe)
+    intervalle : une sauvegarde toutes les `intervalle` itérations (ou générations, étapes)
+    Exemple :
+        reprise = PointReprise("nuit.rep", intervalle=500)
+        tabu_search(matrice, 10**6, 50, reprise=reprise)  # relancer la même ligne après une coupure
+    """
+    def __init__(self, chemin, intervalle=100):
+        self.chemin = chemin
+        self.intervalle = intervalle
+        self.sauvegardes = 0
+
+    def charger(self, algorithme, nombre_villes):
+        """
+        État sauvegardé, ou None si aucun fichier
+        Vérifie qu'il provient du même algorithme et du même nombre de villes
+        """
+        if not os.path.exists(self.chemin):
+            return None
+        etat = lire_etat(self.chemin)
+        if etat.get('algorithme') != algorithme or etat.get('nombre_villes') != nombre_villes:
+            raise ValueError("Le fichier de reprise %s ne correspond pas à cette recherche (%s, %d villes)"
+                             % (self.chemin, algorithme, nombre_villes))
+        return etat
+
+    def a_sauver(self, iteration):
+        return iteration % self.intervalle == 0
+
+    def sauver(self, etat):
+        ecrire_etat(self.chemin, etat)
+        self.sauvegardes += 1
@@ -0,0 +1,126 @@
+import math
+import random
+from itertools import accumulate
+
+# -----------------------------
+# Tables de sélection construites UNE FOIS par génération
+# La fitness de chaque individu est calculée une seule fois et la table des
+# probabilités cumulées est construite une seule fois : chaque tirage coûte
+# ensuite une recherche dichotomique O(log P) au lieu de O(P · n).
+# fitness : fonction individu -> fitness, ou liste des fitness déjà calculées
+# (même ordre que la population, ex: après une évaluation groupée)
+# -----------------------------
+
+def _valeurs_fitness(population, fitness):
+    if callable(fitness):
+        return [fitness(ind) for ind in population]
+    return list(fitness)
+
+class TableSelection:
+    """
+    individus : individus dans l'ordre de la table
+    cumul : poids cumulés (croissants), cumul[-1] = poids total
+    """
+    def __init__(self, individus, poids):
+        self.individus = individus
+        self.cumul = list(accumulate(poids))
+
+    def tirer(self):
+        # random.choices fait la recherche dichotomique dans les poids cumulés
+        return random.choices(self.individus, cum_weights=self.cumul)[0]
+
+    def tirer_lot(self, k):
+        """
+        Tire k individus d'un coup (ex: tous les parents d'une génération)
+        Exemple : tirer_lot(2 * population_size) -> [p1, p2, p1', p2', ...]
+        """
+        return random.choices(self.individus, cum_weights=self.cumul, k=k)
+
+class SelectionRoulette(TableSelection):
+    """
+    Sélection par roulette : probabilité proportionnelle à la fitness
+    Exemple : fitness=[0.2,0.1,0.7] -> cumul=[0.2,0.3,1.0]
+    """
+    def __init__(self, population, fitness):
+        self.fitness = _valeurs_fitness(population, fitness)
+        super().__init__(population, self.fitness)
+
+class SelectionRang(TableSelection):
+    """
+    Sélection par rang : la population est triée une seule fois,
+    le meilleur a le poids n, le pire a le poids 1
+    Exemple : 3 individus -> poids=[3,2,1] -> cumul=[3,5,6]
+    """
+    def __init__(self, population, fitness):
+        valeurs = _valeurs_fitness(population, fitness)
+        ordre = sorted(range(len(population)), key=lambda k: valeurs[k], reverse=True)
+        n = len(population)
+        super().__init__([population[k] for k in ordre], range(n, 0, -1))
+
+# -----------------------------
+# Sélection incrémentale (GA stationnaire, voir genetique.py)
+# La population change de quelques individus à la fois : au lieu de
+# reconstruire la table à chaque remplacement, on la met à jour.
+# -----------------------------
+
+def tirer_rang(taille):
+    """
+    Tire un rang en O(1) : rang 0 (le meilleur) a le poids taille, le dernier le poids 1
+    (mêmes probabilités que SelectionRang, sans table)
+    On tire u dans [0, taille(taille+1)/2) ; en comptant depuis le pire (s = taille-1-rang),
+    les poids cumulés valent s(s+1)/2, donc s = (isqrt(8u+1) - 1) // 2
+    Exemple : taille=3 -> rang 0 avec probabilité 3/6, rang 1 : 2/6, rang 2 : 1/6
+    """
+    u = random.randrange(taille * (taille + 1) // 2)
+    s = (math.isqrt(8 * u + 1) - 1) // 2
+    return taille - 1 - s
+
+class ArbreFenwick:
+    """
+    Poids modifiables un par un et tirage proportionnel au poids, en O(log n) chacun
+    (sélection par roulette sans reconstruire la table cumulée)
+    Exemple : arbre = ArbreFenwick([0.2, 0.1, 0.7]) ; arbre.modifier(1, 0.5) ; arbre.tirer() -> 0, 1 ou 2
+    """
+    def __init__(self, poids):
+        self.construire(poids)
+
+    def construire(self, poids):
+        self.poids = list(poids)
+        n = len(self.poids)
+        self.arbre = [0.0] * (n + 1)
+        for i, p in enumerate(self.poids, 1):
+            self.arbre[i] += p
+            parent = i + (i & -i)
+            if parent <= n:
+                self.arbre[parent] += self.arbre[i]
+        self.total = sum(self.poids)
+        self.modifications = 0
+
+    def modifier(self, indice, poids):
+        delta = poids - self.poids[indice]
+        self.poids[indice] = poids
+        self.total += delta
+        n = len(self.poids)
+        i = indice + 1
+        while i <= n:
+            self.arbre[i] += delta
+            i += i & -i
+        # Les additions successives accumulent des erreurs d'arrondi :
+        # on reconstruit l'arbre (O(n)) toutes les n modifications
+        self.modifications += 1
+        if self.modifications >= n:
+            self.construire(self.poids)
+
+    def tirer(self):
+        # Descente dans l'arbre : plus petit indice dont le poids cumulé dépasse u
+        n = len(self.poids)
+        u = random.random() * self.total
+        position = 0
+        pas = 1 << n.bit_length()
+        while pas:
+            suivant = position + pas
+            if suivant <= n and self.arbre[suivant] <= u:
+                position = suivant
+                u -= self.arbre[suivant]
+            pas >>= 1
+        return min(position, n - 1)
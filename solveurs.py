@@ -0,0 +1,53 @@
+import random
+
+from recuit_simule import recuit_simule
+from tabu import tabu_search
+from genetique import algorithme_genetique
+from exact import resoudre_exact, LIMITE_AUTOMATIQUE
+
+# -----------------------------------------------
+# Point d'entrée commun des algorithmes (utilisation comme bibliothèque)
+# Tous les paramètres sont explicites, avec des valeurs par défaut raisonnables :
+#   resoudre('recuit', matrice_distances, graine=42, voisinage='oropt')
+# Rien n'est lu au clavier ni affiché : utilisable depuis un processus de travail
+# (voir lot.py pour la résolution d'instances en série).
+# Les petites instances (n <= exact.LIMITE_AUTOMATIQUE) sont résolues à
+# l'optimum par exact.py, quel que soit l'algorithme demandé.
+# -----------------------------------------------
+
+def solution_exacte(matrice_distances, controle=None):
+    # Même forme de retour que les autres solveurs (sans l'indicateur prouve)
+    tour, distance, _ = resoudre_exact(matrice_distances, controle)
+    return tour, distance
+
+# nom -> (fonction, paramètres par défaut)
+SOLVEURS = {
+    # T0=None : température initiale estimée ; alpha=None : refroidissement réglé
+    # pour atteindre Tmin en max_iterations (voir refroidissement.py)
+    'recuit': (recuit_simule, {'T0': None, 'Tmin': 1e-3, 'alpha': None, 'max_iterations': 100000,
+                               'voisinage': '2opt'}),
+    'tabou': (tabu_search, {'nombre_iterations': 1000, 'taille_tabu': 20, 'voisinage': '2opt'}),
+    'genetique': (algorithme_genetique, {'population_size': 20, 'generations': 200}),
+    # Held-Karp ou branch and bound : coût exponentiel, réservé aux petites instances
+    'exact': (solution_exacte, {}),
+}
+
+def resoudre(algorithme, matrice_distances, graine=None, controle=None, exact_jusqu_a=LIMITE_AUTOMATIQUE,
+             **parametres):
+    """
+    algorithme : 'recuit', 'tabou', 'genetique' ou 'exact'
+    graine : graine aléatoire (même graine -> même résultat), None = non fixée
+    controle : Controle (voir controle.py) : budget de temps, stagnation, rappel
+    exact_jusqu_a : jusqu'à ce nombre de villes, résolution exacte à la place de
+                    l'algorithme demandé (0 = jamais)
+    parametres : remplacent les paramètres par défaut de SOLVEURS
+    Retourne (meilleure_solution, meilleure_distance)
+    """
+    if algorithme not in SOLVEURS:
+        raise ValueError("Algorithme inconnu : %r (choix : %s)" % (algorithme, ", ".join(SOLVEURS)))
+    if len(matrice_distances) <= exact_jusqu_a:
+        return solution_exacte(matrice_distances, controle)
+    fonction, defauts = SOLVEURS[algorithme]
+    if graine is not None:
+        random.seed(graine)
+    return fonction(matrice_distances, controle=controle, **dict(defauts, **parametres))
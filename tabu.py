@@ -1,16 +1,10 @@
 import random
-from collections import deque
 
-def calculer_distance_totale(solution, matrice_distances):
-    distance_totale = 0
-    # On parcourt la solution et on additionne les distances entre chaque ville consécutive
-    for i in range(len(solution) - 1):
-        distance_totale += matrice_distances[solution[i]][solution[i + 1]]
-    # On ajoute la distance pour retourner au point de départ (circuit fermé)
-    # Exemple : si solution = [0, 2, 1]
-    # On ajoute la distance entre 1 → 0
-    distance_totale += matrice_distances[solution[-1]][solution[0]]
-    return distance_totale
+from voisinage import creer_voisinage
+from cache_fitness import CacheDistances, calculer_distance_totale
+from instrumentation import instrumenter_voisinage, instrumenter_evaluation_groupee, compter_cache
+from sauvegarde import compacter
+from construction import construire_tour
 
 def generer_voisins(solution):
     # Génère toutes les solutions voisines en échangeant 2 villes dans la solution
@@ -24,47 +18,182 @@ def generer_voisins(solution):
             voisins.append(voisin)
     return voisins
 
-def tabu_search(matrice_distances, nombre_iterations, taille_tabu):
+# -----------------------------------------------
+# Mémoire taboue par attributs
+# Au lieu de mémoriser des solutions complètes (comparaison élément par élément),
+# on mémorise les paires de villes échangées avec l'itération jusqu'à laquelle
+# elles restent taboues. Le test tabou est alors une simple lecture : O(1).
+# Pour 2-opt et Or-opt, les paires mémorisées sont les arêtes retirées.
+# Exemple : on échange les villes 3 et 7 à l'itération 10 avec une durée de 5
+# -> la paire (3, 7) est taboue jusqu'à l'itération 15
+# -----------------------------------------------
+class MemoireTabou:
+    def __init__(self, nombre_villes, duree):
+        self.nombre_villes = nombre_villes
+        self.duree = duree
+        # Table de hachage : expiration[a * n + b] = itération de fin du statut tabou
+        # Seules les paires encore (ou récemment) taboues y figurent (pas de tableau
+        # n x n, qui ne tiendrait pas en mémoire pour des dizaines de milliers de villes)
+        self.expiration = {}
+        # Les paires expirées sont retirées quand on les relit (est_tabou), et par un
+        # balayage complet quand la table dépasse ce seuil (coût amorti O(1))
+        self.seuil_nettoyage = 1024
+
+    def _indice(self, a, b):
+        # La paire (a, b) est la même que (b, a)
+        if a > b:
+            a, b = b, a
+        return a * self.nombre_villes + b
+
+    def est_tabou(self, a, b, iteration):
+        indice = self._indice(a, b)
+        fin = self.expiration.get(indice)
+        if fin is None:
+            return False
+        if fin <= iteration:
+            del self.expiration[indice]
+            return False
+        return True
+
+    def ajouter(self, a, b, iteration):
+        self.expiration[self._indice(a, b)] = iteration + self.duree
+        if len(self.expiration) > self.seuil_nettoyage:
+            self.nettoyer(iteration)
+
+    def nettoyer(self, iteration):
+        # Retire toutes les paires dont le statut tabou a expiré
+        self.expiration = {indice: fin for indice, fin in self.expiration.items() if fin > iteration}
+        self.seuil_nettoyage = max(1024, 2 * len(self.expiration))
+
+# voisinage : 'echange', '2opt' ou 'oropt' (voir voisinage.py)
+# k_voisins : taille des listes de plus proches voisins pour 2opt / oropt
+# cache : CacheDistances partagé entre plusieurs appels (optionnel)
+# controle : Controle (voir controle.py) pour un budget de temps, un arrêt sur
+#            stagnation ou un rappel à chaque amélioration (optionnel)
+# instrumentation : Instrumentation (voir instrumentation.py) pour mesurer le
+#                   temps par phase et les compteurs (optionnel, sans coût sinon)
+# reprise : PointReprise (voir sauvegarde.py) : sauvegarde régulière de l'état,
+#           et reprise depuis le fichier s'il existe déjà (optionnel)
+# init : tour de départ, 'aleatoire' (par défaut), 'plus_proche_voisin', 'glouton',
+#        'hilbert', 'insertion' (voir construction.py) ou un parcours déjà construit
+# coordonnees : coordonnées des villes, pour init='hilbert' sur une matrice dense
+def tabu_search(matrice_distances, nombre_iterations, taille_tabu, voisinage='echange', k_voisins=10, cache=None,
+                controle=None, instrumentation=None, reprise=None, init='aleatoire', coordonnees=None):
+    if controle is not None:
+        controle.demarrer()
     nombre_villes = len(matrice_distances)
     
-    # Création d'une solution initiale aléatoire
+    # Création de la solution initiale (par défaut aléatoire)
     # Exemple : [0, 1, 2, 3, ..., n] puis on mélange
-    solution_actuelle = list(range(nombre_villes))
-    random.shuffle(solution_actuelle)
+    solution_actuelle = construire_tour(init, matrice_distances, k_voisins, coordonnees)
     
     # On suppose que cette solution initiale est la meilleure pour l'instant
     meilleure_solution = solution_actuelle[:]
-    meilleure_distance = calculer_distance_totale(solution_actuelle, matrice_distances)
+    if cache is None:
+        cache = CacheDistances(matrice_distances)
+    succes_cache, echecs_cache = cache.succes, cache.echecs
+    meilleure_distance = cache.distance(solution_actuelle)
+    distance_actuelle = meilleure_distance
+    if controle is not None:
+        controle.signaler(meilleure_solution, meilleure_distance)
     
-    # Liste Taboue : mémorise les dernières solutions visitées pour éviter de les revisiter
-    # maxlen = taille maximale, elle supprime automatiquement les anciennes solutions
-    tabu_list = deque(maxlen=taille_tabu)
+    # Mémoire taboue : les paires de villes échangées récemment sont interdites
+    # pendant taille_tabu itérations. La durée est bornée par la moitié du nombre
+    # de mouvements possibles, sinon tous les mouvements finiraient tabous.
+    nombre_mouvements = nombre_villes * (nombre_villes - 1) // 2
+    memoire_tabou = MemoireTabou(nombre_villes, max(1, min(taille_tabu, nombre_mouvements // 2)))
+    
+    # Reprise : on repart de l'état sauvegardé (solutions, mémoire taboue, générateur random)
+    debut = 0
+    etat = reprise.charger('tabou', nombre_villes) if reprise is not None else None
+    if etat is not None:
+        solution_actuelle[:] = etat['solution_actuelle']
+        distance_actuelle = etat['distance_actuelle']
+        meilleure_solution = list(etat['meilleure_solution'])
+        meilleure_distance = etat['meilleure_distance']
+        memoire_tabou.expiration = etat['expiration']
+        debut = etat['iteration']
+        random.setstate(etat['aleatoire'])
+        if controle is not None:
+            controle.signaler(meilleure_solution, meilleure_distance)
+    
+    def sauver(iteration):
+        # État au début de l'itération `iteration` (les précédentes sont faites)
+        reprise.sauver({
+            'algorithme': 'tabou',
+            'nombre_villes': nombre_villes,
+            'iteration': iteration,
+            'solution_actuelle': compacter(solution_actuelle),
+            'distance_actuelle': distance_actuelle,
+            'meilleure_solution': compacter(meilleure_solution),
+            'meilleure_distance': meilleure_distance,
+            'expiration': memoire_tabou.expiration,
+            'aleatoire': random.getstate(),
+        })
+    
+    # Le voisinage travaille directement sur solution_actuelle (mouvements sur place)
+    # Pour l'échange, tout le voisinage est évalué d'un bloc avec NumPy s'il est disponible
+    voisins = creer_voisinage(voisinage, matrice_distances, k_voisins)
+    voisins.preparer(solution_actuelle)
+    if instrumentation is not None:
+        if voisinage == 'echange':
+            n = len(solution_actuelle)
+            instrumenter_evaluation_groupee(voisins, instrumentation, n * (n - 1) // 2)
+        instrumenter_voisinage(voisins, instrumentation,
+                               {'meilleur': 'recherche', 'delta': 'evaluation', 'appliquer': 'application'})
     
     # Boucle d'optimisation
-    for _ in range(nombre_iterations):
-        # Générer toutes les solutions voisines
-        voisins = generer_voisins(solution_actuelle)
+    prochaine = nombre_iterations  # première itération non faite (pour la dernière sauvegarde)
+    for iteration in range(debut, nombre_iterations):
+        if reprise is not None and iteration > debut and reprise.a_sauver(iteration):
+            sauver(iteration)
+        # Budget de temps épuisé ou stagnation : on garde la meilleure solution trouvée
+        if controle is not None and not controle.continuer():
+            prochaine = iteration
+            break
         
-        # On enlève les solutions déjà tabou
-        voisins = [v for v in voisins if v not in tabu_list]
+        # Évaluer tous les mouvements avec le delta en O(1) : O(n²) au total
+        # (O(n·k) avec les listes de voisins) au lieu de recalculer chaque voisin : O(n³)
+        # On prend le meilleur mouvement non tabou
+        # Critère d'aspiration : un mouvement tabou est accepté s'il améliore la meilleure solution
+        def admissible(mouvement, delta):
+            if distance_actuelle + delta < meilleure_distance:
+                return True
+            return not any(memoire_tabou.est_tabou(a, b, iteration)
+                           for a, b in voisins.attributs_tabou(mouvement))
+        if instrumentation is not None:
+            admissible = instrumentation.chronometrer('filtre_tabou', admissible)
+        mouvement_choisi = voisins.meilleur(admissible)
         
         # Si aucun voisin disponible (par exemple si tout est tabou), on arrête
-        if not voisins:
+        if mouvement_choisi is None:
             break
         
-        # On choisit le voisin qui donne la plus petite distance totale
-        # On minimise la fonction coût = calculer_distance_totale
-        solution_actuelle = min(voisins, key=lambda x: calculer_distance_totale(x, matrice_distances))
-        distance_actuelle = calculer_distance_totale(solution_actuelle, matrice_distances)
+        # On interdit de revenir en arrière pendant quelques itérations
+        delta, mouvement = mouvement_choisi
+        for a, b in voisins.attributs_a_interdire(mouvement):
+            memoire_tabou.ajouter(a, b, iteration)
         
-        # On ajoute cette solution à la liste taboue pour ne pas y revenir rapidement
-        tabu_list.append(solution_actuelle)
+        # On applique le mouvement choisi sur la solution actuelle (sans la recalculer)
+        voisins.appliquer(mouvement)
+        distance_actuelle += delta
         
         # Si cette solution est meilleure que la meilleure trouvée jusque-là, on la garde
         if distance_actuelle < meilleure_distance:
             meilleure_solution = solution_actuelle[:]
             meilleure_distance = distance_actuelle
+            if controle is not None:
+                controle.signaler(meilleure_solution, meilleure_distance)
+            if instrumentation is not None:
+                instrumentation.evenement('amelioration', iteration=iteration, distance=meilleure_distance)
+    
+    if reprise is not None:
+        sauver(max(prochaine, debut))
     
+    # Distance exacte de la meilleure solution (sans cumul d'erreurs d'arrondi des deltas)
+    meilleure_distance = cache.distance(meilleure_solution)
+    if instrumentation is not None:
+        compter_cache(instrumentation, cache, succes_cache, echecs_cache)
     return meilleure_solution, meilleure_distance
 
 
@@ -84,11 +213,13 @@ matrice_distances = [
 
 # Paramètres de recherche tabou
 nombre_iterations = 1000  # nombre de recherches/générations
-taille_tabu = 50  # taille de la mémoire taboue
+taille_tabu = 50  # durée (en itérations) pendant laquelle un échange reste tabou
 
 # Exécution de la recherche
-meilleure_solution, meilleure_distance = tabu_search(matrice_distances, nombre_iterations, taille_tabu)
+# (seulement si le fichier est lancé directement : l'importer ne lance rien)
+if __name__ == "__main__":
+    meilleure_solution, meilleure_distance = tabu_search(matrice_distances, nombre_iterations, taille_tabu)
 
-print("Tabu Search")
-print("Meilleur Solution trouvée:", meilleure_solution)
-print("Distance Minimale:", meilleure_distance)
+    print("Tabu Search")
+    print("Meilleur Solution trouvée:", meilleure_solution)
+    print("Distance Minimale:", meilleure_distance)
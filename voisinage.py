@@ -0,0 +1,307 @@
+import random
+import heapq
+
+from mouvements import delta_echange, appliquer_echange, matrice_numpy, meilleur_echange
+
+# -----------------------------------------------
+# Voisinages interchangeables pour le recuit simulé, la recherche tabou
+# et la mutation de l'algorithme génétique :
+#   'echange' : échanger deux villes (voisinage d'origine)
+#   '2opt'    : inverser un segment du parcours
+#   'oropt'   : déplacer un segment de 1 à 3 villes ailleurs dans le parcours
+# Le delta de chaque mouvement se calcule en O(1) à partir des arêtes modifiées.
+# Pour 2-opt et Or-opt, les candidats peuvent être limités aux k plus proches
+# voisins de chaque ville : O(n·k) mouvements au lieu de O(n²).
+# Les formules de 2-opt supposent une matrice symétrique (d(a,b) = d(b,a)).
+# -----------------------------------------------
+
+def listes_voisins(matrice_distances, k):
+    """
+    Pour chaque ville, les k villes les plus proches (triées par distance).
+    Exemple : voisins[0] = [2, 1, 5] -> la ville 2 est la plus proche de 0
+    """
+    n = len(matrice_distances)
+    k = min(k, n - 1)
+    # Matrice paresseuse (chargement.py) : index spatial au lieu de parcourir n² distances
+    if hasattr(matrice_distances, 'plus_proches'):
+        return [matrice_distances.plus_proches(a, k) for a in range(n)]
+    voisins = []
+    for a in range(n):
+        ligne = matrice_distances[a]
+        autres = (b for b in range(n) if b != a)
+        voisins.append(heapq.nsmallest(k, autres, key=lambda b: ligne[b]))
+    return voisins
+
+class Voisinage:
+    """
+    Interface commune des voisinages.
+    preparer(solution) : attache la solution (modifiée sur place par appliquer)
+    tirer() : un mouvement aléatoire (recuit simulé, mutation), None s'il n'y en a pas
+    candidats() : tous les mouvements à examiner (recherche tabou)
+    delta(mouvement) : variation de distance en O(1)
+    appliquer(mouvement) : modifie la solution sur place
+    attributs_tabou(mouvement) : paires de villes à tester dans la mémoire taboue
+    attributs_a_interdire(mouvement) : paires à rendre taboues (avant d'appliquer)
+    """
+    def __init__(self, matrice_distances, k_voisins=None):
+        self.matrice = matrice_distances
+        self.voisins = listes_voisins(matrice_distances, k_voisins) if k_voisins else None
+        self.solution = None
+        self.positions = None
+
+    def preparer(self, solution):
+        self.solution = solution
+        # positions[ville] = indice de la ville dans la solution
+        self.positions = [0] * len(self.matrice)
+        for k, ville in enumerate(solution):
+            self.positions[ville] = k
+
+    def meilleur(self, admissible):
+        """
+        Retourne (delta, mouvement) pour le meilleur mouvement admissible, ou None.
+        admissible(mouvement, delta) n'est appelée que pour les mouvements qui améliorent
+        le meilleur candidat courant.
+        """
+        meilleur = None
+        for mouvement in self.candidats():
+            delta = self.delta(mouvement)
+            if (meilleur is None or delta < meilleur[0]) and admissible(mouvement, delta):
+                meilleur = (delta, mouvement)
+        return meilleur
+
+    def muter(self, solution):
+        # Mutation pour l'algorithme génétique : copie + un mouvement aléatoire
+        enfant = solution[:]
+        self.preparer(enfant)
+        mouvement = self.tirer()
+        if mouvement is not None:
+            self.appliquer(mouvement)
+        return enfant
+
+# -----------------------------------------------
+# Échange de deux villes : mouvement (i, j) avec i < j
+# -----------------------------------------------
+class Echange(Voisinage):
+    def __init__(self, matrice_distances, k_voisins=None):
+        # Pas de listes de voisins pour l'échange : tous les couples sont examinés
+        super().__init__(matrice_distances)
+        self._matrice_np = None
+        self._matrice_np_construite = False
+
+    @property
+    def matrice_np(self):
+        # Copie NumPy de la matrice construite au premier appel de meilleur() :
+        # le recuit et la mutation du GA (tirer, delta) n'en ont jamais besoin
+        if not self._matrice_np_construite:
+            self._matrice_np = matrice_numpy(self.matrice)
+            self._matrice_np_construite = True
+        return self._matrice_np
+
+    def tirer(self):
+        if len(self.solution) < 2:
+            return None
+        return tuple(sorted(random.sample(range(len(self.solution)), 2)))
+
+    def candidats(self):
+        n = len(self.solution)
+        for i in range(n):
+            for j in range(i + 1, n):
+                yield i, j
+
+    def meilleur(self, admissible):
+        # Évaluation groupée (NumPy) ou par tas, voir mouvements.meilleur_echange
+        resultat = meilleur_echange(
+            self.solution, self.matrice,
+            lambda i, j, delta: admissible((i, j), delta),
+            self.matrice_np,
+        )
+        if resultat is None:
+            return None
+        delta, i, j = resultat
+        return delta, (i, j)
+
+    def delta(self, mouvement):
+        i, j = mouvement
+        return delta_echange(self.solution, self.matrice, i, j)
+
+    def appliquer(self, mouvement):
+        i, j = mouvement
+        appliquer_echange(self.solution, i, j)
+        self.positions[self.solution[i]] = i
+        self.positions[self.solution[j]] = j
+
+    def attributs_tabou(self, mouvement):
+        i, j = mouvement
+        return [(self.solution[i], self.solution[j])]
+
+    def attributs_a_interdire(self, mouvement):
+        # Rééchanger les deux mêmes villes annulerait le mouvement
+        return self.attributs_tabou(mouvement)
+
+# -----------------------------------------------
+# 2-opt : mouvement (i, j) avec i < j, on inverse le segment solution[i+1..j]
+# Arêtes retirées : (a, b) et (c, d) ; arêtes ajoutées : (a, c) et (b, d)
+# Ex : [A, B, C, D, E] avec i=0, j=3 -> [A, D, C, B, E]
+# Deux mouvements créent l'arête (a, c) entre deux villes aux positions p et q :
+# (p, q) (a et c perdent leurs successeurs) et (p-1, q-1) (leurs prédécesseurs)
+# -----------------------------------------------
+class DeuxOpt(Voisinage):
+    def _valide(self, i, j):
+        n = len(self.solution)
+        # j = i+1 ou (0, n-1) : le parcours ne change pas
+        return i + 1 < j and not (i == 0 and j == n - 1)
+
+    def _villes(self, mouvement):
+        i, j = mouvement
+        s = self.solution
+        return s[i], s[i + 1], s[j], s[(j + 1) % len(s)]
+
+    def _creant_arete(self, a, c, avant=False):
+        # Mouvement qui crée l'arête (a, c) ; avant=True : variante par les prédécesseurs
+        p, q = self.positions[a], self.positions[c]
+        if avant:
+            n = len(self.solution)
+            p, q = (p - 1) % n, (q - 1) % n
+        return (p, q) if p < q else (q, p)
+
+    def tirer(self):
+        n = len(self.solution)
+        if n < 4:
+            return None
+        if self.voisins:
+            # Candidat guidé : relier une ville a à l'un de ses plus proches voisins c
+            a = random.randrange(n)
+            c = random.choice(self.voisins[a])
+            i, j = self._creant_arete(a, c, random.random() < 0.5)
+            if self._valide(i, j):
+                return i, j
+        while True:
+            i, j = sorted(random.sample(range(n), 2))
+            if self._valide(i, j):
+                return i, j
+
+    def candidats(self):
+        n = len(self.solution)
+        if self.voisins:
+            # Les deux mouvements qui créent l'arête (a, c) : O(n·k) candidats
+            for a in self.solution:
+                for c in self.voisins[a]:
+                    for avant in (False, True):
+                        i, j = self._creant_arete(a, c, avant)
+                        if self._valide(i, j):
+                            yield i, j
+        else:
+            for i in range(n):
+                for j in range(i + 2, n):
+                    if self._valide(i, j):
+                        yield i, j
+
+    def delta(self, mouvement):
+        a, b, c, d = self._villes(mouvement)
+        m = self.matrice
+        return m[a][c] + m[b][d] - m[a][b] - m[c][d]
+
+    def appliquer(self, mouvement):
+        i, j = mouvement
+        self.solution[i + 1:j + 1] = self.solution[i + 1:j + 1][::-1]
+        for k in range(i + 1, j + 1):
+            self.positions[self.solution[k]] = k
+
+    def attributs_tabou(self, mouvement):
+        a, b, c, d = self._villes(mouvement)
+        return [(a, c), (b, d)]
+
+    def attributs_a_interdire(self, mouvement):
+        # On interdit de recréer les arêtes retirées
+        a, b, c, d = self._villes(mouvement)
+        return [(a, b), (c, d)]
+
+# -----------------------------------------------
+# Or-opt : mouvement (i, L, j), le segment solution[i..i+L-1] est déplacé
+# entre les villes des positions j et j+1 (j hors du segment)
+# Arêtes retirées : (p, f), (l, q), (c, d) ; arêtes ajoutées : (p, q), (c, f), (l, d)
+# Ex : [A, B, C, D, E] avec i=1, L=1, j=3 -> [A, C, D, B, E]
+# -----------------------------------------------
+class OrOpt(Voisinage):
+    def __init__(self, matrice_distances, k_voisins=None, longueur_max=3):
+        super().__init__(matrice_distances, k_voisins)
+        self.longueur_max = longueur_max
+
+    def _valide(self, i, longueur, j):
+        n = len(self.solution)
+        if longueur + 2 > n or i + longueur > n:
+            return False
+        # j dans le segment ou juste avant lui : le parcours ne change pas
+        return not (i <= j < i + longueur) and j != (i - 1) % n
+
+    def _villes(self, mouvement):
+        i, longueur, j = mouvement
+        s = self.solution
+        n = len(s)
+        p, f = s[(i - 1) % n], s[i]
+        l, q = s[i + longueur - 1], s[(i + longueur) % n]
+        c, d = s[j], s[(j + 1) % n]
+        return p, f, l, q, c, d
+
+    def tirer(self):
+        n = len(self.solution)
+        if n < 3:
+            return None
+        longueur = random.randint(1, min(self.longueur_max, n - 2))
+        if self.voisins:
+            # Candidat guidé : placer le segment qui commence par f juste après un voisin de f
+            f = random.randrange(n)
+            c = random.choice(self.voisins[f])
+            mouvement = (self.positions[f], longueur, self.positions[c])
+            if self._valide(*mouvement):
+                return mouvement
+        while True:
+            mouvement = (random.randrange(n - longueur + 1), longueur, random.randrange(n))
+            if self._valide(*mouvement):
+                return mouvement
+
+    def candidats(self):
+        n = len(self.solution)
+        for i in range(n):
+            for longueur in range(1, self.longueur_max + 1):
+                if self.voisins:
+                    destinations = (self.positions[c] for c in self.voisins[self.solution[i]])
+                else:
+                    destinations = range(n)
+                for j in destinations:
+                    if self._valide(i, longueur, j):
+                        yield i, longueur, j
+
+    def delta(self, mouvement):
+        p, f, l, q, c, d = self._villes(mouvement)
+        m = self.matrice
+        return m[p][q] + m[c][f] + m[l][d] - m[p][f] - m[l][q] - m[c][d]
+
+    def appliquer(self, mouvement):
+        i, longueur, j = mouvement
+        s = self.solution
+        segment = s[i:i + longueur]
+        reste = s[:i] + s[i + longueur:]
+        k = j if j < i else j - longueur  # position de c dans reste
+        s[:] = reste[:k + 1] + segment + reste[k + 1:]
+        for pos, ville in enumerate(s):
+            self.positions[ville] = pos
+
+    def attributs_tabou(self, mouvement):
+        p, f, l, q, c, d = self._villes(mouvement)
+        return [(p, q), (c, f), (l, d)]
+
+    def attributs_a_interdire(self, mouvement):
+        p, f, l, q, c, d = self._villes(mouvement)
+        return [(p, f), (l, q), (c, d)]
+
+VOISINAGES = {
+    'echange': Echange,
+    '2opt': DeuxOpt,
+    'oropt': OrOpt,
+}
+
+def creer_voisinage(nom, matrice_distances, k_voisins=None):
+    if nom not in VOISINAGES:
+        raise ValueError("Voisinage inconnu : %r (choix : %s)" % (nom, ", ".join(VOISINAGES)))
+    return VOISINAGES[nom](matrice_distances, k_voisins)